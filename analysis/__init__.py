@@ -1,7 +1,31 @@
-from .text_analyzer import TextAnalyzer
+import importlib
+
+# 导出名称 -> 所在子模块；首次访问时才导入（PEP 562），
+# 导入 analysis 包不会加载 jieba、gensim 和 pandas
+_LAZY_EXPORTS = {
+    'TextAnalyzer': '.text_analyzer',
+    'SparseCorpus': '.corpus',
+    'StreamedCorpus': '.corpus',
+    'TokenizedCorpus': '.corpus',
+    'AnalysisPipeline': '.pipeline',
+}
 
 __version__ = '1.0.0'
 __author__ = 'Your Name'
 __description__ = 'Text analysis module for comment processing'
 
-__all__ = ['TextAnalyzer'] 
\ No newline at end of file
+__all__ = ['TextAnalyzer', 'TokenizedCorpus', 'StreamedCorpus', 'SparseCorpus', 'AnalysisPipeline']
+
+
+def __getattr__(name):
+    """首次访问导出名称时导入所在子模块"""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
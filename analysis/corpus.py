@@ -0,0 +1,190 @@
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+
+if TYPE_CHECKING:
+    # gensim 和 scipy 在构建词袋语料时才导入，只统计词频时不需要加载
+    from gensim import corpora, matutils
+    from scipy import sparse
+
+
+class TokenizedCorpus:
+    """分词语料，每条评论只分词一次，供词频统计和主题分析共用"""
+    
+    def __init__(self, texts: List[List[str]], word_freq: Optional[Counter] = None):
+        """
+        Args:
+            texts: 分词后的文本列表，每个元素是一条评论的词语列表
+            word_freq: 与 texts 对应的词频统计；提供时 extend 随追加同步更新，
+                       为None时首次访问 word_freq 再统计
+        """
+        self.texts = texts
+        self._word_freq = word_freq
+        
+    @property
+    def word_freq(self) -> Counter:
+        """全部评论的词频统计（首次访问时计算）"""
+        if self._word_freq is None:
+            word_freq = Counter()
+            for words in self.texts:
+                word_freq.update(words)
+            self._word_freq = word_freq
+        return self._word_freq
+    
+    def extend(self, texts: Iterable[List[str]]):
+        """追加分词结果（流水线模式下逐页加入），已计算的词频同步更新"""
+        texts = list(texts)
+        self.texts.extend(texts)
+        if self._word_freq is not None:
+            for words in texts:
+                self._word_freq.update(words)
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def __iter__(self) -> Iterator[List[str]]:
+        return iter(self.texts)
+    
+    def __bool__(self) -> bool:
+        return bool(self.texts)
+
+
+class StreamedCorpus:
+    """
+    流式语料，用于超大评论文件
+    
+    词频和词典按块增量构建，词袋语料序列化为 MmCorpus 存放在磁盘上，
+    每次迭代时从文件读取；文档哈希同样逐行写在 MmCorpus 旁的文件中，
+    需要时再读取，内存占用与评论总数无关。
+    """
+    
+    def __init__(self, 
+                 word_freq: Counter, 
+                 dictionary: 'corpora.Dictionary', 
+                 corpus_path: Path,
+                 doc_hashes_path: Optional[Path] = None):
+        """
+        Args:
+            word_freq: 全部评论的词频统计
+            dictionary: 全部评论构建的词典
+            corpus_path: MmCorpus 文件路径
+            doc_hashes_path: 各文档分词结果的哈希文件（每行一个），随模型保存，
+                             供增量训练识别新文档
+        """
+        self.word_freq = word_freq
+        self.dictionary = dictionary
+        self.corpus_path = Path(corpus_path)
+        self.doc_hashes_path = Path(doc_hashes_path) if doc_hashes_path else None
+        
+        from gensim import corpora
+        self.bow_corpus = corpora.MmCorpus(str(self.corpus_path))
+        
+    def iter_doc_hashes(self) -> Iterator[str]:
+        """逐行读取文档哈希，没有哈希文件时为空"""
+        if self.doc_hashes_path is None:
+            return
+        with open(self.doc_hashes_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield line.rstrip('\n')
+        
+    def __len__(self) -> int:
+        return len(self.bow_corpus)
+    
+    def __iter__(self) -> Iterator[List[Tuple[int, int]]]:
+        return iter(self.bow_corpus)
+    
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+class SparseCorpus:
+    """
+    基于 scipy CSR 矩阵的紧凑词袋语料（行为文档，列为词）
+    
+    相比 doc2bow 生成的元组列表，内存占用小得多；训练时转换为 gensim 的
+    Sparse2Corpus（不复制数据），可视化时直接以矩阵形式传给 pyLDAvis。
+    """
+    
+    def __init__(self, matrix: 'sparse.csr_matrix'):
+        self.matrix = matrix.tocsr()
+        
+    @classmethod
+    def from_texts(cls, 
+                   texts: Iterable[List[str]], 
+                   dictionary: 'corpora.Dictionary') -> 'SparseCorpus':
+        """用词典把分词文本直接转换为CSR矩阵"""
+        from scipy import sparse
+        
+        indptr = array('q', [0])
+        indices = array('i')
+        data = array('f')
+        for text in texts:
+            for token_id, count in dictionary.doc2bow(text):
+                indices.append(token_id)
+                data.append(count)
+            indptr.append(len(indices))
+            
+        matrix = sparse.csr_matrix(
+            (np.frombuffer(data, dtype=np.float32),
+             np.frombuffer(indices, dtype=np.int32),
+             np.frombuffer(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(dictionary))
+        )
+        return cls(matrix)
+    
+    def to_gensim(self) -> 'matutils.Sparse2Corpus':
+        """转换为 gensim 可直接训练的流式语料"""
+        from gensim import matutils
+        return matutils.Sparse2Corpus(self.matrix, documents_columns=False)
+    
+    def drop_empty(self) -> Tuple['SparseCorpus', int]:
+        """
+        去掉没有任何词的文档（裁剪词表后可能全部的词都被去掉）
+        
+        Returns:
+            (新语料, 去掉的文档数)
+        """
+        non_empty = np.diff(self.matrix.indptr) > 0
+        dropped = int(len(non_empty) - non_empty.sum())
+        if not dropped:
+            return self, 0
+        return SparseCorpus(self.matrix[non_empty]), dropped
+    
+    def term_doc_matrix(self) -> 'sparse.csc_matrix':
+        """词-文档矩阵（CSC），pyLDAvis 可直接使用"""
+        return self.matrix.T
+    
+    @property
+    def nbytes(self) -> int:
+        """矩阵数据占用的字节数"""
+        return (self.matrix.data.nbytes + self.matrix.indices.nbytes 
+                + self.matrix.indptr.nbytes)
+    
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+    
+    def __iter__(self) -> Iterator[List[Tuple[int, float]]]:
+        return iter(self.to_gensim())
+    
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+def iter_comment_chunks(path: Path, 
+                        chunk_size: int, 
+                        encoding: str = 'utf-8') -> Iterator[List[str]]:
+    """按块读取评论文件（每行一条评论），跳过空行"""
+    chunk = []
+    with open(path, 'r', encoding=encoding) as f:
+        for line in f:
+            comment = line.strip()
+            if not comment:
+                continue
+            chunk.append(comment)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
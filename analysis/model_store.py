@@ -0,0 +1,104 @@
+from pathlib import Path
+from typing import Iterable, Optional, Set, Tuple
+from gensim import corpora, models
+from utils.output_manager import OutputManager
+
+
+class ModelStore:
+    """LDA模型和词典的持久化，文件保存在每次运行目录的 models 子目录下"""
+
+    SUBDIR = 'models'
+    MODEL_FILE = 'lda.model'
+    DICTIONARY_FILE = 'dictionary.dict'
+    DOC_HASHES_FILE = 'doc_hashes.txt'
+    PRUNED_TOKENS_FILE = 'pruned_tokens.txt'
+    MODEL_KEY_FILE = 'model_key.txt'
+
+    def __init__(self, base_dir: Path):
+        """
+        Args:
+            base_dir: 输出基础目录（OUTPUT.BASE_DIR），用于查找历史运行的模型
+        """
+        self.base_dir = Path(base_dir)
+
+    def save(self,
+             model_dir: Path,
+             lda_model: models.LdaModel,
+             dictionary: corpora.Dictionary,
+             doc_hashes: Iterable[str],
+             pruned_tokens: Iterable[str] = (),
+             model_key: Optional[str] = None) -> None:
+        """
+        保存模型、词典、已训练文档的哈希和裁剪词表时去掉的词
+
+        model_key 标识模型对应的商品或评论来源，增量训练只复用同一来源的模型。
+        """
+        model_dir = Path(model_dir)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        lda_model.save(str(model_dir / self.MODEL_FILE))
+        dictionary.save(str(model_dir / self.DICTIONARY_FILE))
+        self._write_lines(model_dir / self.DOC_HASHES_FILE, doc_hashes)
+        self._write_lines(model_dir / self.PRUNED_TOKENS_FILE, sorted(pruned_tokens))
+        if model_key is not None:
+            self._write_lines(model_dir / self.MODEL_KEY_FILE, [model_key])
+
+    def load(self, model_dir: Path
+             ) -> Tuple[models.LdaModel, corpora.Dictionary, Set[str], Set[str]]:
+        """加载模型、词典、已训练文档的哈希和裁剪词表时去掉的词"""
+        model_dir = Path(model_dir)
+        lda_model = models.LdaModel.load(str(model_dir / self.MODEL_FILE))
+        dictionary = corpora.Dictionary.load(str(model_dir / self.DICTIONARY_FILE))
+        doc_hashes = self._read_lines(model_dir / self.DOC_HASHES_FILE)
+        pruned_tokens = self._read_lines(model_dir / self.PRUNED_TOKENS_FILE)
+        return lda_model, dictionary, doc_hashes, pruned_tokens
+
+    @staticmethod
+    def _write_lines(path: Path, lines: Iterable[str]) -> None:
+        """每行写入一项"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for line in lines:
+                f.write(line + '\n')
+
+    @staticmethod
+    def _read_lines(path: Path) -> Set[str]:
+        """读取每行一项的文件，文件不存在（旧版本保存的模型）时返回空集合"""
+        if not path.exists():
+            return set()
+        with open(path, 'r', encoding='utf-8') as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def read_key(self, model_dir: Path) -> Optional[str]:
+        """模型对应的商品或评论来源，未记录（旧版本保存的模型）时返回None"""
+        path = Path(model_dir) / self.MODEL_KEY_FILE
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+
+    def find_latest(self, exclude: Path = None, model_key: Optional[str] = None) -> Optional[Path]:
+        """
+        查找最近一次保存了同一来源模型的运行目录下的模型目录
+
+        批量分析目录下每个商品各有一个运行目录，在其中按模型文件的修改时间从新到旧查找。
+        只返回 model_key 与给定值相同的模型，其他商品的模型不会被用来增量训练。
+        """
+        if not self.base_dir.exists():
+            return None
+
+        exclude = Path(exclude).resolve() if exclude is not None else None
+        for run_dir in OutputManager.list_runs(self.base_dir):
+            if OutputManager.BATCH_DIR_PATTERN.match(run_dir.name):
+                candidates = [d for d in run_dir.iterdir()
+                              if d.is_dir() and (d / self.SUBDIR / self.MODEL_FILE).exists()]
+                candidates.sort(key=lambda d: (d / self.SUBDIR / self.MODEL_FILE).stat().st_mtime,
+                                reverse=True)
+            else:
+                candidates = [run_dir]
+            for candidate in candidates:
+                if exclude is not None and candidate.resolve() == exclude:
+                    continue
+                model_dir = candidate / self.SUBDIR
+                if ((model_dir / self.MODEL_FILE).exists()
+                        and self.read_key(model_dir) == model_key):
+                    return model_dir
+        return None
@@ -0,0 +1,103 @@
+import threading
+from collections import Counter
+from queue import Empty, Queue
+from typing import Dict, Iterable, List, Optional, Union
+from .corpus import TokenizedCorpus
+
+# 队列结束标记
+_STOP = object()
+
+
+class AnalysisPipeline:
+    """
+    爬取与分词并行的流水线
+
+    爬虫每爬完一页就把评论放入有界队列（on_page 回调），消费者线程随即
+    分词并追加到语料中。爬取期间的等待时间被分词利用，爬取结束后
+    只剩主题分析需要完成。队列满时爬虫会等待消费者，内存占用有上限。
+    """
+
+    def __init__(self, analyzer, queue_size: int = 100, batch_pages: int = 10):
+        """
+        Args:
+            analyzer: TextAnalyzer，负责分词
+            queue_size: 队列最多缓存的页数
+            batch_pages: 消费者每次最多合并处理的页数
+        """
+        self.analyzer = analyzer
+        self.batch_pages = batch_pages
+        # 词频随每页分词结果累加，爬取结束时不必再遍历全部评论统计
+        self.corpus = TokenizedCorpus([], Counter())
+        self.num_comments = 0
+        self._queue: Queue = Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def start(self) -> 'AnalysisPipeline':
+        """启动消费者线程"""
+        self._thread = threading.Thread(target=self._consume, name='analysis-pipeline',
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def on_page(self, reviews: Iterable[Union[Dict, str]]):
+        """
+        爬虫回调：放入一页评论（评论字典或正文），队列满时阻塞
+
+        消费者线程出错后不再接收评论，爬取继续进行。
+        """
+        if self._error is not None:
+            return
+        texts = [review['text'] if isinstance(review, dict) else review for review in reviews]
+        if texts:
+            self._queue.put(texts)
+
+    def _next_batch(self) -> Optional[List[str]]:
+        """取出若干页评论合并为一批，收到结束标记时返回None"""
+        item = self._queue.get()
+        if item is _STOP:
+            return None
+        batch = list(item)
+        for _ in range(self.batch_pages - 1):
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                break
+            if item is _STOP:
+                # 放回结束标记，处理完本批后再退出
+                self._queue.put(item)
+                break
+            batch.extend(item)
+        return batch
+
+    def _consume(self):
+        """消费者线程：分词并追加到语料"""
+        try:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    break
+                self.corpus.extend(self.analyzer._segment_comments(batch))
+                self.num_comments += len(batch)
+        except BaseException as e:
+            self._error = e
+            print(f"流水线分词出错: {str(e)}")
+            # 继续取出队列中的评论，避免爬虫阻塞在 put 上
+            while self._queue.get() is not _STOP:
+                pass
+
+    def close(self) -> TokenizedCorpus:
+        """
+        通知消费者爬取结束，等待剩余评论处理完毕并返回语料
+
+        Raises:
+            RuntimeError: 消费者线程分词出错
+        """
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            raise RuntimeError(f"流水线分词失败: {str(self._error)}") from self._error
+        print(f"流水线已完成 {self.num_comments} 条评论的分词，有效评论 {len(self.corpus)} 条")
+        return self.corpus
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import jieba
+
+# 分词规则（清理正则、过滤条件）变化时递增，使旧缓存全部失效
+SEGMENT_RULES_VERSION = 1
+
+# SQLite 单条语句的变量数上限较低，批量查询时分批进行
+_BATCH_SIZE = 500
+
+# 超出容量时淘汰到最大条数的这一比例，之后要再写入这么多条才会再次淘汰
+_EVICT_TO_RATIO = 0.9
+
+
+def segment_fingerprint(stopwords: Iterable[str]) -> str:
+    """
+    计算分词环境指纹
+
+    指纹涵盖停用词集合、jieba 词典文件及其修改时间、词典总词频
+    （load_userdict/add_word 会改变该值）和分词规则版本，
+    任何一项变化都会使缓存失效。
+    """
+    jieba.initialize()
+    dict_path = jieba.dt.dictionary or os.path.join(
+        os.path.dirname(jieba.__file__), jieba.DEFAULT_DICT_NAME
+    )
+    try:
+        stat = os.stat(dict_path)
+        dict_state = f"{dict_path}:{stat.st_size}:{int(stat.st_mtime)}"
+    except (OSError, TypeError):
+        dict_state = str(dict_path)
+
+    parts = [
+        f"rules={SEGMENT_RULES_VERSION}",
+        f"jieba={jieba.__version__}",
+        f"dict={dict_state}",
+        f"total={jieba.dt.total}",
+        "stopwords=" + "|".join(sorted(stopwords)),
+    ]
+    return hashlib.sha1("\n".join(parts).encode('utf-8')).hexdigest()
+
+
+class SegmentCache:
+    """基于SQLite的持久化分词缓存，以清理后评论文本的哈希为键"""
+
+    def __init__(self, db_path: Path, fingerprint: str, max_entries: int = 1000000):
+        """
+        Args:
+            db_path: 缓存数据库文件路径
+            fingerprint: 分词环境指纹，与库中记录不一致时清空缓存
+            max_entries: 最大缓存条数，超出后按最近使用时间淘汰
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+
+        # 流水线模式下由消费者线程使用，同一时刻只有一个线程访问
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens ("
+            "key TEXT PRIMARY KEY, tokens TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tokens_last_used ON tokens (last_used)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._check_fingerprint(fingerprint)
+        # 条数只在打开时统计一次，之后随写入估算（覆盖已有键时偏大），淘汰时再精确统计
+        self._count = len(self)
+
+    def _check_fingerprint(self, fingerprint: str):
+        """停用词或词典变化时清空缓存"""
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE name = 'fingerprint'"
+        ).fetchone()
+        if row is None or row[0] != fingerprint:
+            if row is not None:
+                print("分词环境已变化，清空分词缓存")
+            with self.conn:
+                self.conn.execute("DELETE FROM tokens")
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('fingerprint', ?)",
+                    (fingerprint,)
+                )
+
+    @staticmethod
+    def make_key(text: str) -> str:
+        """计算文本的缓存键"""
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """查询单条缓存，未命中返回None"""
+        return self.get_many([key]).get(key)
+
+    def put(self, key: str, tokens: List[str]):
+        """写入单条缓存"""
+        self.put_many({key: tokens})
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[str]]:
+        """批量查询缓存，返回命中的键到分词结果的映射，并刷新其使用时间"""
+        unique_keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+        with self.conn:
+            for i in range(0, len(unique_keys), _BATCH_SIZE):
+                batch = unique_keys[i:i + _BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT key, tokens FROM tokens WHERE key IN ({placeholders})",
+                    batch
+                ).fetchall()
+                for key, tokens in rows:
+                    found[key] = json.loads(tokens)
+                if rows:
+                    hit_keys = [key for key, _ in rows]
+                    self.conn.execute(
+                        f"UPDATE tokens SET last_used = ? "
+                        f"WHERE key IN ({','.join('?' * len(hit_keys))})",
+                        [now] + hit_keys
+                    )
+        return found
+
+    def put_many(self, entries: Dict[str, List[str]]):
+        """批量写入缓存，写入后按容量淘汰"""
+        if not entries:
+            return
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO tokens (key, tokens, last_used) VALUES (?, ?, ?)",
+                [(key, json.dumps(tokens, ensure_ascii=False), now)
+                 for key, tokens in entries.items()]
+            )
+        self._count += len(entries)
+        self.evict()
+
+    def evict(self):
+        """
+        超出最大条数时删除最久未使用的条目
+
+        估算条数未超出时直接返回，不查询数据库；超出时精确统计，
+        并一次淘汰到最大条数的 _EVICT_TO_RATIO，避免写满后每次写入都要淘汰。
+        """
+        if self._count <= self.max_entries:
+            return
+        self._count = len(self)
+        if self._count <= self.max_entries:
+            return
+        target = int(self.max_entries * _EVICT_TO_RATIO)
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM tokens WHERE key IN ("
+                "SELECT key FROM tokens ORDER BY last_used ASC LIMIT ?)",
+                (self._count - target,)
+            )
+        self._count = target
+
+    def clear(self):
+        """清空缓存"""
+        with self.conn:
+            self.conn.execute("DELETE FROM tokens")
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
@@ -1,16 +1,80 @@
-import jieba
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import json
 import re
-from typing import Dict, List
-from .topic_analyzer import TopicAnalyzer
-import pandas as pd
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Union
+from .corpus import StreamedCorpus, TokenizedCorpus, iter_comment_chunks
+from utils import config
+
+if TYPE_CHECKING:
+    # jieba、gensim、pandas 和主题分析器在用到时才导入，导入本模块时不加载
+    import pandas as pd
+    from gensim import corpora
+    from .segment_cache import SegmentCache
+    from .topic_analyzer import TopicAnalyzer
+
+
+def _clean(text: str) -> str:
+    """去除特殊字符"""
+    return re.sub(r'[^\w\s]', '', text)
+
+
+def _cut(text: str, stopwords: set) -> List[str]:
+    """jieba分词并过滤停用词和单字"""
+    import jieba
+    
+    return [word for word in jieba.cut(text)
+            if word not in stopwords and len(word) > 1]
+
+
+def _segment_chunk(texts: List[str], stopwords: set) -> List[List[str]]:
+    """对一批已清理的文本进行分词，供进程池调用（保持输入顺序）"""
+    return [_cut(text, stopwords) for text in texts]
+
 
 class TextAnalyzer:
     """文本分析器，用于处理和分析评论文本"""
     
-    def __init__(self, output_manager=None):
+    def __init__(self, output_manager=None, render_pool=None, model_key=None):
+        analysis_config = config.get('ANALYSIS')
+        self.segment_workers = analysis_config.get('SEGMENT_WORKERS', 1)
+        self.segment_chunk_size = analysis_config.get('SEGMENT_CHUNK_SIZE', 2000)
+        self.cache_config = analysis_config.get('SEGMENT_CACHE', {})
+        self.streaming_chunk_size = analysis_config.get('STREAMING', {}).get('CHUNK_SIZE', 5000)
+        
         self.stopwords = self._get_stopwords()
-        self.topic_analyzer = TopicAnalyzer(output_manager)
+        self._segment_cache = None
+        self.output_manager = output_manager
+        self.render_pool = render_pool
+        self.model_key = model_key
+        self._topic_analyzer = None
+        
+    @property
+    def topic_analyzer(self) -> 'TopicAnalyzer':
+        """主题分析器（首次使用时创建）"""
+        if self._topic_analyzer is None:
+            from .topic_analyzer import TopicAnalyzer
+            self._topic_analyzer = TopicAnalyzer(self.output_manager, self.render_pool,
+                                                 self.model_key)
+        return self._topic_analyzer
+    
+    def set_output_manager(self, output_manager):
+        """
+        切换输出目录，已加载的停用词、分词缓存和渲染进程池继续复用
+        
+        批量分析时每个商品使用自己的运行目录，jieba 词典等只加载一次。
+        主题分析器会重新创建，增量训练的模型查找和主题数扫描结果不会带到下一个商品。
+        """
+        self.output_manager = output_manager
+        self._topic_analyzer = None
+        
+    def set_model_key(self, model_key):
+        """设置评论所属商品或来源的标识，保存的模型带上该标识，增量训练只复用同一标识的模型"""
+        self.model_key = model_key
+        if self._topic_analyzer is not None:
+            self._topic_analyzer.model_key = model_key
         
     def _get_stopwords(self) -> set:
         """获取停用词集合"""
@@ -22,39 +86,181 @@ class TextAnalyzer:
     
     def _clean_text(self, text: str) -> str:
         """清理文本，去除特殊字符"""
-        return re.sub(r'[^\w\s]', '', text)
+        return _clean(text)
+    
+    def _get_segment_cache(self) -> Optional['SegmentCache']:
+        """按需打开分词缓存，未启用或打开失败时返回None"""
+        if self._segment_cache is None and self.cache_config.get('ENABLED', True):
+            try:
+                from .segment_cache import SegmentCache, segment_fingerprint
+                
+                cache_path = (Path(config.get('OUTPUT.BASE_DIR', 'output'))
+                              / 'cache'
+                              / self.cache_config.get('FILE', 'segment_cache.sqlite'))
+                self._segment_cache = SegmentCache(
+                    cache_path,
+                    segment_fingerprint(self.stopwords),
+                    max_entries=self.cache_config.get('MAX_ENTRIES', 1000000)
+                )
+            except Exception as e:
+                print(f"打开分词缓存失败，将不使用缓存: {str(e)}")
+                self.cache_config = dict(self.cache_config, ENABLED=False)
+        return self._segment_cache
     
     def _segment_text(self, text: str) -> List[str]:
-        """对文本进行分词"""
-        return [word for word in jieba.cut(text)
-                if word not in self.stopwords and len(word) > 1]
+        """对文本进行分词，优先读取分词缓存"""
+        cache = self._get_segment_cache()
+        if cache is None:
+            return _cut(text, self.stopwords)
+            
+        key = cache.make_key(text)
+        words = cache.get(key)
+        if words is None:
+            words = _cut(text, self.stopwords)
+            cache.put(key, words)
+        return words
     
     def _segment_comments(self, comments: List[str]) -> List[List[str]]:
-        """对所有评论进行分词"""
-        segmented_comments = []
-        for comment in comments:
-            cleaned_text = self._clean_text(comment)
-            words = self._segment_text(cleaned_text)
-            if words:  # 只添加非空的分词结果
-                segmented_comments.append(words)
-        return segmented_comments
-    
-    def analyze_comments(self, comments: List[str]) -> Counter:
+        """对所有评论进行分词，已缓存的评论直接复用分词结果"""
+        cleaned_texts = [self._clean_text(comment) for comment in comments]
+        
+        cache = self._get_segment_cache()
+        if cache is None:
+            segmented = self._segment_cleaned(cleaned_texts)
+        else:
+            keys = [cache.make_key(text) for text in cleaned_texts]
+            cached = cache.get_many(keys)
+            
+            # 未命中的文本去重后再分词
+            missing = {}
+            for key, text in zip(keys, cleaned_texts):
+                if key not in cached and key not in missing:
+                    missing[key] = text
+            if missing:
+                fresh = dict(zip(missing, self._segment_cleaned(list(missing.values()))))
+                cache.put_many(fresh)
+                cached.update(fresh)
+                
+            hits = sum(1 for key in keys if key not in missing)
+            print(f"分词缓存命中 {hits}/{len(keys)} 条评论")
+            segmented = [cached[key] for key in keys]
+            
+        # 只保留非空的分词结果
+        return [words for words in segmented if words]
+    
+    def _segment_cleaned(self, texts: List[str]) -> List[List[str]]:
+        """对已清理的文本分词，数量足够时使用进程池"""
+        if self.segment_workers > 1 and len(texts) > self.segment_chunk_size:
+            return self._segment_parallel(texts)
+        return [_cut(text, self.stopwords) for text in texts]
+    
+    def _segment_parallel(self, texts: List[str]) -> List[List[str]]:
+        """
+        使用进程池并行分词
+        
+        文本列表按 SEGMENT_CHUNK_SIZE 切片后分发给子进程，
+        executor.map 按提交顺序返回结果，因此输出与串行分词完全一致。
+        """
+        import jieba
+        
+        chunks = [texts[i:i + self.segment_chunk_size]
+                  for i in range(0, len(texts), self.segment_chunk_size)]
+        workers = min(self.segment_workers, len(chunks))
+        
+        segmented = []
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=jieba.initialize) as executor:
+            for chunk_result in executor.map(_segment_chunk, chunks,
+                                             [self.stopwords] * len(chunks)):
+                segmented.extend(chunk_result)
+        return segmented
+    
+    def build_corpus(self, comments: List[str]) -> TokenizedCorpus:
+        """对评论列表分词一次，构建可复用的分词语料"""
+        return TokenizedCorpus(self._segment_comments(comments))
+    
+    def build_streamed_corpus(self, 
+                              comments_path: Path, 
+                              chunk_size: int = None) -> StreamedCorpus:
+        """
+        流式读取评论文件（每行一条评论）构建语料，内存占用与评论条数无关
+        
+        第一遍按块分词，增量更新词频和词典，把分词结果逐行写入临时文件，
+        各文档的哈希（增量训练用）逐行写入 MmCorpus 旁的 doc_hashes.txt；
+        第二遍读取分词文件生成词袋，序列化为 MmCorpus。
+        
+        Args:
+            comments_path: 评论文件路径
+            chunk_size: 每块评论条数，默认使用 ANALYSIS.STREAMING.CHUNK_SIZE
+        """
+        from gensim import corpora
+        
+        chunk_size = chunk_size or self.streaming_chunk_size
+        work_dir = self._get_corpus_dir()
+        tokens_path = work_dir / 'tokens.jsonl'
+        corpus_path = work_dir / 'corpus.mm'
+        doc_hashes_path = work_dir / 'doc_hashes.txt'
+        
+        word_freq = Counter()
+        dictionary = corpora.Dictionary()
+        num_docs = 0
+        with open(tokens_path, 'w', encoding='utf-8') as f, \
+                open(doc_hashes_path, 'w', encoding='utf-8') as hash_file:
+            for chunk in iter_comment_chunks(comments_path, chunk_size):
+                texts = self._segment_comments(chunk)
+                for words in texts:
+                    word_freq.update(words)
+                    hash_file.write(self.topic_analyzer._doc_hash(words) + '\n')
+                    f.write(json.dumps(words, ensure_ascii=False) + '\n')
+                dictionary.add_documents(texts)
+                num_docs += len(texts)
+                print(f"已流式处理 {num_docs} 条有效评论")
+        
+        self.topic_analyzer.prune_dictionary(dictionary)
+        corpora.MmCorpus.serialize(str(corpus_path), 
+                                   self._iter_bow(tokens_path, dictionary))
+        tokens_path.unlink()
+        
+        corpus = StreamedCorpus(word_freq, dictionary, corpus_path, doc_hashes_path)
+        dropped = num_docs - len(corpus)
+        if dropped:
+            print(f"去掉裁剪词表后为空的文档 {dropped} 篇")
+        return corpus
+    
+    def _get_corpus_dir(self) -> Path:
+        """流式语料的存放目录：有输出管理器时放在运行目录的data下，否则使用临时目录"""
+        if self.output_manager:
+            return self.output_manager.data_dir
+        return Path(tempfile.mkdtemp(prefix='lda_corpus_'))
+    
+    @staticmethod
+    def _iter_bow(tokens_path: Path, 
+                  dictionary: 'corpora.Dictionary') -> Iterator[List[Tuple[int, int]]]:
+        """逐行读取分词文件并转换为词袋，跳过裁剪词表后为空的文档"""
+        with open(tokens_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                bow = dictionary.doc2bow(json.loads(line))
+                if bow:
+                    yield bow
+    
+    def _ensure_corpus(self, 
+                       comments: Union[List[str], TokenizedCorpus, StreamedCorpus]
+                       ) -> Union[TokenizedCorpus, StreamedCorpus]:
+        """传入评论列表时现场分词，传入已构建的语料时直接复用"""
+        if isinstance(comments, (TokenizedCorpus, StreamedCorpus)):
+            return comments
+        return self.build_corpus(comments)
+    
+    def analyze_comments(self, 
+                         comments: Union[List[str], TokenizedCorpus, StreamedCorpus]) -> Counter:
         """分析评论文本，返回词频统计"""
         if not comments:
             print("警告：没有评论数据")
             return Counter()
             
         try:
-            # 合并所有评论
-            all_comments = " ".join(comments)
-            
-            # 清理文本
-            cleaned_text = self._clean_text(all_comments)
-            
             # 分词并统计
-            words = self._segment_text(cleaned_text)
-            word_freq = Counter(words)
+            word_freq = self._ensure_corpus(comments).word_freq
             
             print(f"分析完成，共统计 {len(word_freq)} 个不同词语")
             return word_freq
@@ -63,24 +269,32 @@ class TextAnalyzer:
             print(f"分析评论时出错: {str(e)}")
             return Counter()
     
-    def analyze_topics(self, comments: List[str]) -> pd.DataFrame:
+    def analyze_topics(self, 
+                       comments: Union[List[str], TokenizedCorpus, StreamedCorpus]) -> 'pd.DataFrame':
         """
         对评论进行主题分析
         
         Args:
-            comments: 评论列表
+            comments: 评论列表，或 build_corpus/build_streamed_corpus 生成的语料
             
         Returns:
             包含主题分析结果的DataFrame
         """
+        import pandas as pd
+        
         try:
             # 分词预处理
-            texts = self._segment_comments(comments)
-            if not texts:
+            corpus = self._ensure_corpus(comments)
+            if not corpus:
                 raise ValueError("没有有效的分词结果")
             
             # 进行主题分析
-            results = self.topic_analyzer.analyze(texts)
+            if isinstance(corpus, StreamedCorpus):
+                results = self.topic_analyzer.analyze_bow(corpus.bow_corpus, 
+                                                          corpus.dictionary,
+                                                          doc_hashes=corpus.iter_doc_hashes())
+            else:
+                results = self.topic_analyzer.analyze(corpus.texts)
             if not results:
                 raise ValueError("主题分析失败")
             
@@ -92,4 +306,4 @@ class TextAnalyzer:
             
         except Exception as e:
             print(f"主题分析时出错: {str(e)}")
-            return pd.DataFrame() 
\ No newline at end of file
+            return pd.DataFrame()
\ No newline at end of file
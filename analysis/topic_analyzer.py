@@ -1,21 +1,98 @@
-from typing import List, Dict
-from gensim import corpora, models
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from gensim import corpora, models, utils
+from gensim.models import CoherenceModel
 import numpy as np
 import pandas as pd
 from collections import namedtuple
 from visualization.topic_visualizer import TopicVisualizer
 from utils import config
+from .corpus import SparseCorpus
+from .model_store import ModelStore
+
+# doc_topics: 文档-主题分布矩阵 (文档数 x 主题数)，每行和为1
+# dominant_topics: 每篇文档的主导主题编号
+TopicAnalysisResult = namedtuple(
+    'TopicAnalysisResult', 
+    ['topics', 'proportions', 'doc_topics', 'dominant_topics']
+)
+
+def _train_candidate(num_topics: int, 
+                     corpus_path: str, 
+                     dictionary_path: str, 
+                     model_dir: str) -> Dict:
+    """
+    在子进程中训练一个候选主题数的模型并评分
+    
+    语料和词典从父进程序列化好的文件读取（MmCorpus 按需从磁盘流式读取），
+    不随任务 pickle 传递。
+    """
+    corpus = corpora.MmCorpus(corpus_path)
+    dictionary = corpora.Dictionary.load(dictionary_path)
+    
+    analyzer = TopicAnalyzer()
+    analyzer.backend = 'single'  # 已在进程池中并行，子进程内不再开多进程
+    lda_model = analyzer._train_lda(corpus, dictionary, num_topics)
+    
+    coherence = CoherenceModel(
+        model=lda_model, corpus=corpus, dictionary=dictionary, coherence='u_mass'
+    ).get_coherence()
+    perplexity = np.exp2(-lda_model.log_perplexity(corpus))
+    
+    model_path = str(Path(model_dir) / f'lda_{num_topics}.model')
+    lda_model.save(model_path)
+    return {
+        '主题数': num_topics,
+        '一致性(u_mass)': coherence,
+        '困惑度': perplexity,
+        'model_path': model_path
+    }
 
-TopicAnalysisResult = namedtuple('TopicAnalysisResult', ['topics', 'proportions'])
 
 class TopicAnalyzer:
     """主题分析器，使用LDA模型进行评论主题分析"""
     
-    def __init__(self, output_manager=None):
+    def __init__(self, output_manager=None, render_pool=None, model_key=None):
         analysis_config = config.get('ANALYSIS')
         self.num_topics = analysis_config.get('TOPIC_COUNT', 5)
         self.num_words = analysis_config.get('WORDS_PER_TOPIC', 15)
-        self.visualizer = TopicVisualizer(output_manager) if output_manager else None
+        
+        # 词表裁剪参数，KEEP_N 未设置时沿用 TOP_WORDS_COUNT
+        pruning_config = analysis_config.get('PRUNING', {})
+        self.pruning_enabled = pruning_config.get('ENABLED', True)
+        self.min_word_length = analysis_config.get('MIN_WORD_LENGTH', 2)
+        self.no_below = pruning_config.get('NO_BELOW', 2)
+        self.no_above = pruning_config.get('NO_ABOVE', 0.5)
+        self.keep_n = pruning_config.get('KEEP_N') or analysis_config.get('TOP_WORDS_COUNT', 100)
+        
+        # LDA训练参数
+        lda_config = analysis_config.get('LDA', {})
+        self.backend = lda_config.get('BACKEND', 'single')
+        self.workers = lda_config.get('WORKERS') or max(1, (os.cpu_count() or 2) - 1)
+        self.passes = lda_config.get('PASSES', 10)
+        self.chunksize = lda_config.get('CHUNKSIZE', 2000)
+        self.iterations = lda_config.get('ITERATIONS', 50)
+        
+        # 模型持久化与增量训练
+        model_config = analysis_config.get('MODEL', {})
+        self.save_model = model_config.get('SAVE', True)
+        self.incremental = model_config.get('INCREMENTAL', False)
+        self.max_delta_ratio = model_config.get('MAX_DELTA_RATIO', 0.5)
+        # 评论所属商品或来源的标识，随模型保存；增量训练只查找同一标识的模型
+        self.model_key = model_key
+        # 裁剪词表时去掉的词，随模型保存，增量训练时不会被新文档重新加入词典
+        self.pruned_tokens = set()
+        
+        # 主题数扫描
+        self.sweep_config = analysis_config.get('TOPIC_SWEEP', {})
+        self.model_store = ModelStore(config.get('OUTPUT.BASE_DIR', 'output'))
+        
+        self.output_manager = output_manager
+        self.visualizer = TopicVisualizer(output_manager, render_pool) if output_manager else None
         
     def analyze(self, texts: List[List[str]]) -> TopicAnalysisResult:
         """
@@ -31,62 +108,419 @@ class TopicAnalyzer:
             if not texts:
                 raise ValueError("输入文本为空")
                 
-            # 创建词典和语料库
-            dictionary = corpora.Dictionary(texts)
-            corpus = [dictionary.doc2bow(text) for text in texts]
+            doc_hashes = [self._doc_hash(text) for text in texts]
+            lda_model, update_corpus = None, None
             
-            # 训练LDA模型
-            lda_model = models.LdaModel(
-                corpus=corpus,
-                id2word=dictionary,
-                num_topics=self.num_topics,
-                random_state=42,
-                update_every=1,
-                passes=10,
-                alpha='auto',
-                per_word_topics=True
-            )
+            warm_start = self._load_warm_start(texts, doc_hashes) if self.incremental else None
+            if warm_start:
+                # 增量模式：扩展已有词典，只用新文档更新已有模型
+                lda_model, dictionary, new_texts, seen_hashes, pruned_tokens = warm_start
+                # 保留历史文档哈希，避免旧文档在下次增量训练中被当作新文档
+                doc_hashes = list(seen_hashes.union(doc_hashes))
+                self.pruned_tokens = pruned_tokens
+                self._merge_new_words(dictionary, new_texts)
+                self._extend_vocabulary(lda_model, dictionary)
+                update_corpus = [dictionary.doc2bow(text) for text in new_texts]
+            else:
+                # 创建词典并裁剪词表
+                dictionary = corpora.Dictionary(texts)
+                self.prune_dictionary(dictionary)
+                
+            corpus = SparseCorpus.from_texts(texts, dictionary)
+            
+        except Exception as e:
+            print(f"主题分析出错: {str(e)}")
+            return None
+            
+        return self.analyze_bow(corpus, dictionary, 
+                                lda_model=lda_model, 
+                                update_corpus=update_corpus, 
+                                doc_hashes=doc_hashes)
+    
+    def analyze_bow(self, 
+                    corpus: Iterable[List[Tuple[int, int]]], 
+                    dictionary: corpora.Dictionary,
+                    lda_model: Optional[models.LdaModel] = None,
+                    update_corpus: Optional[List[List[Tuple[int, int]]]] = None,
+                    doc_hashes: Optional[Iterable[str]] = None) -> TopicAnalysisResult:
+        """
+        对词袋语料进行主题分析
+        
+        Args:
+            corpus: 词袋语料，可以是 SparseCorpus、列表或 MmCorpus 等流式语料
+            dictionary: 与语料对应的词典
+            lda_model: 已有模型，提供时不重新训练，只用 update_corpus 更新
+            update_corpus: 增量更新所用的新文档词袋
+            doc_hashes: 模型已训练文档的哈希，随模型保存，供下次增量训练识别新文档；
+                        可以是逐行读取哈希文件的迭代器，保存模型时才读取
+            
+        Returns:
+            TopicAnalysisResult，包含主题词和主题分布
+        """
+        try:
+            # 裁剪词表后没有任何词的文档不参与训练，也不计入主题占比
+            corpus, dropped = self._drop_empty_docs(corpus)
+            if update_corpus:
+                update_corpus = [bow for bow in update_corpus if bow]
+            if dropped:
+                print(f"去掉裁剪词表后为空的文档 {dropped} 篇")
+            
+            num_docs = len(corpus)
+            if not num_docs:
+                raise ValueError("输入语料为空")
+            
+            # CSR语料训练和推断时使用 Sparse2Corpus 视图，可视化时直接传矩阵
+            bow_corpus = corpus.to_gensim() if isinstance(corpus, SparseCorpus) else corpus
+            
+            # 训练LDA模型（扫描主题数时使用扫描选出的主题数，配置的 TOPIC_COUNT 不变）
+            num_topics = self.num_topics
+            if lda_model is None and self.sweep_config.get('ENABLED', False):
+                _, lda_model, num_topics = self.sweep_topics(bow_corpus, dictionary)
+            elif lda_model is None:
+                lda_model = self._train_lda(bow_corpus, dictionary, num_topics)
+            elif update_corpus:
+                print(f"增量更新LDA模型，新文档 {len(update_corpus)} 篇")
+                lda_model.update(update_corpus)
+            else:
+                print("没有新文档，直接复用已有LDA模型")
+            self._save_model(lda_model, dictionary, doc_hashes or [])
             
             # 获取主题词分布
             topics = []
-            for topic_id in range(self.num_topics):
+            for topic_id in range(num_topics):
                 topic_words = lda_model.show_topic(topic_id, topn=self.num_words)
                 topics.append(topic_words)
             
             # 计算主题分布
-            topic_proportions = np.zeros(self.num_topics)
-            for bow in corpus:
-                topic_dist = lda_model.get_document_topics(bow)
-                main_topic = max(topic_dist, key=lambda x: x[1])[0]
-                topic_proportions[main_topic] += 1
-            
-            topic_proportions = topic_proportions / len(corpus)
-            
-            # 生成可视化
-            print("\n生成主题模型可视化...")
-            self.visualizer.visualize_lda(texts, lda_model, dictionary)
-            
-            # 生成主题分布图
-            topic_names = [f'主题 {i+1}' for i in range(self.num_topics)]
-            self.visualizer.plot_topic_distribution(
-                topic_names, 
-                topic_proportions,
-                title="评论主题分布"
-            )
+            doc_topics = self._infer_doc_topics(lda_model, bow_corpus)
+            dominant_topics = doc_topics.argmax(axis=1)
+            topic_proportions = np.bincount(
+                dominant_topics, minlength=num_topics
+            ) / num_docs
             
-            return TopicAnalysisResult(topics=topics, proportions=topic_proportions)
+            if self.visualizer:
+                # 生成可视化
+                print("\n生成主题模型可视化...")
+                self.visualizer.visualize_lda(corpus, lda_model, dictionary, doc_topics)
+                
+                # 生成主题分布图（有渲染进程池时在后台绘制）
+                topic_names = [f'主题 {i+1}' for i in range(num_topics)]
+                self.visualizer.plot_topic_distribution(
+                    topic_names, 
+                    topic_proportions,
+                    title="评论主题分布"
+                )
+            
+            return TopicAnalysisResult(
+                topics=topics, 
+                proportions=topic_proportions,
+                doc_topics=doc_topics,
+                dominant_topics=dominant_topics
+            )
             
         except Exception as e:
             print(f"主题分析出错: {str(e)}")
             return None
     
+    def prune_dictionary(self, dictionary: corpora.Dictionary) -> corpora.Dictionary:
+        """
+        训练前裁剪词表（原地修改）
+        
+        去掉短于 MIN_WORD_LENGTH 的词，再用 filter_extremes 去掉文档频次低于
+        NO_BELOW 的长尾词（多为错别字）和出现在超过 NO_ABOVE 比例文档中的泛用词，
+        最后只保留频次最高的 KEEP_N 个词。裁剪后词典ID会重新压缩。
+        """
+        if not self.pruning_enabled:
+            return dictionary
+            
+        vocab_before = len(dictionary)
+        tokens_before = set(dictionary.token2id)
+        short_ids = [token_id for token, token_id in dictionary.token2id.items()
+                     if len(token) < self.min_word_length]
+        dictionary.filter_tokens(bad_ids=short_ids)
+        dictionary.filter_extremes(no_below=self.no_below, 
+                                   no_above=self.no_above, 
+                                   keep_n=self.keep_n)
+        self.pruned_tokens = tokens_before.difference(dictionary.token2id)
+        print(f"词表裁剪: {vocab_before} -> {len(dictionary)} 个词")
+        return dictionary
+    
+    @staticmethod
+    def _drop_empty_docs(corpus: Iterable[List[Tuple[int, int]]]
+                         ) -> Tuple[Iterable[List[Tuple[int, int]]], int]:
+        """
+        去掉没有任何词的文档
+        
+        流式语料（MmCorpus）在序列化时已跳过空文档，这里原样返回。
+        
+        Returns:
+            (语料, 去掉的文档数)
+        """
+        if isinstance(corpus, SparseCorpus):
+            return corpus.drop_empty()
+        if isinstance(corpus, list):
+            non_empty = [bow for bow in corpus if bow]
+            return non_empty, len(corpus) - len(non_empty)
+        return corpus, 0
+    
+    def _merge_new_words(self, 
+                         dictionary: corpora.Dictionary, 
+                         new_texts: List[List[str]]) -> corpora.Dictionary:
+        """
+        增量训练时把新文档的词合并进已有词典（原地修改）
+        
+        已有词典的ID不能重排，因此只决定哪些新词可以加入：全量训练时已被裁剪的词
+        （self.pruned_tokens）不再加回；新词按 MIN_WORD_LENGTH、NO_BELOW 过滤，
+        NO_ABOVE 按新旧文档总数计算；加入后词典总词数不超过 KEEP_N，超出时保留
+        文档频次最高的新词。因 NO_ABOVE 被去掉的新词同样记入 self.pruned_tokens。
+        已有词的文档频次随之更新。
+        """
+        new_dictionary = corpora.Dictionary(new_texts)
+        if not self.pruning_enabled:
+            dictionary.merge_with(new_dictionary)
+            return dictionary
+        
+        total_docs = dictionary.num_docs + new_dictionary.num_docs
+        max_df = self.no_above * total_docs
+        candidates = []
+        for token, token_id in new_dictionary.token2id.items():
+            if token in dictionary.token2id or token in self.pruned_tokens:
+                continue
+            if len(token) < self.min_word_length:
+                continue
+            df = new_dictionary.dfs.get(token_id, 0)
+            if df > max_df:
+                self.pruned_tokens.add(token)
+            elif df >= self.no_below:
+                candidates.append((df, token))
+        
+        room = max(0, self.keep_n - len(dictionary)) if self.keep_n else len(candidates)
+        candidates.sort(key=lambda item: (-item[0], item[1]))
+        added = {token for _, token in candidates[:room]}
+        
+        good_ids = [token_id for token, token_id in new_dictionary.token2id.items()
+                    if token in added or token in dictionary.token2id]
+        new_dictionary.filter_tokens(good_ids=good_ids)
+        dictionary.merge_with(new_dictionary)
+        print(f"增量训练词典新增 {len(added)} 个词（候选 {len(candidates)} 个）")
+        return dictionary
+    
+    @staticmethod
+    def _doc_hash(text: List[str]) -> str:
+        """计算分词后文档的哈希，用于识别已训练过的文档"""
+        return hashlib.blake2b('\x1f'.join(text).encode('utf-8'), 
+                               digest_size=16).hexdigest()
+    
+    def _load_warm_start(self, 
+                         texts: List[List[str]], 
+                         doc_hashes: List[str]
+                         ) -> Optional[Tuple[models.LdaModel, corpora.Dictionary, 
+                                             List[List[str]], set, set]]:
+        """
+        加载同一商品（model_key）最近一次保存的模型用于增量训练
+        
+        主题数不一致或新文档占比超过 MAX_DELTA_RATIO 时返回None，改为全量训练。
+        
+        Returns:
+            (模型, 词典, 新文档列表, 已训练文档哈希, 裁剪词表时去掉的词) 或 None
+        """
+        exclude = self.output_manager.run_dir if self.output_manager else None
+        model_dir = self.model_store.find_latest(exclude=exclude, model_key=self.model_key)
+        if model_dir is None:
+            print("未找到同一商品已保存的模型，进行全量训练")
+            return None
+            
+        try:
+            lda_model, dictionary, seen_hashes, pruned_tokens = self.model_store.load(model_dir)
+        except Exception as e:
+            print(f"加载已保存的模型失败，进行全量训练: {str(e)}")
+            return None
+            
+        if lda_model.num_topics != self.num_topics:
+            print("已保存模型的主题数与配置不一致，进行全量训练")
+            return None
+            
+        new_texts = [text for text, doc_hash in zip(texts, doc_hashes) 
+                     if doc_hash not in seen_hashes]
+        delta_ratio = len(new_texts) / len(texts)
+        if delta_ratio > self.max_delta_ratio:
+            print(f"新文档占比 {delta_ratio:.1%} 超过 {self.max_delta_ratio:.0%}，进行全量训练")
+            return None
+            
+        print(f"从 {model_dir} 加载模型进行增量训练，新文档占比 {delta_ratio:.1%}")
+        return lda_model, dictionary, new_texts, seen_hashes, pruned_tokens
+    
+    @staticmethod
+    def _extend_vocabulary(lda_model: models.LdaModel, 
+                           dictionary: corpora.Dictionary) -> None:
+        """
+        将模型的词表扩展到词典的大小
+        
+        LdaModel 的词表在训练时固定，新词对应的 sstats 列补零、eta 沿用已有先验，
+        再同步 expElogbeta，之后 update() 才能使用新词。
+        """
+        new_terms = len(dictionary) - lda_model.num_terms
+        if new_terms <= 0:
+            return
+            
+        dtype = lda_model.dtype
+        eta_fill = lda_model.eta.mean()
+        lda_model.eta = np.concatenate(
+            [lda_model.eta, np.full(new_terms, eta_fill, dtype=dtype)]
+        )
+        lda_model.state.eta = lda_model.eta
+        lda_model.state.sstats = np.hstack(
+            [lda_model.state.sstats, 
+             np.zeros((lda_model.num_topics, new_terms), dtype=dtype)]
+        )
+        lda_model.num_terms = len(dictionary)
+        lda_model.id2word = dictionary
+        lda_model.sync_state()
+        print(f"词典新增 {new_terms} 个词")
+    
+    def _save_model(self, 
+                    lda_model: models.LdaModel, 
+                    dictionary: corpora.Dictionary, 
+                    doc_hashes: Iterable[str]) -> None:
+        """将模型、词典和文档哈希保存到本次运行目录"""
+        if not (self.save_model and self.output_manager):
+            return
+        try:
+            model_dir = self.output_manager.run_dir / ModelStore.SUBDIR
+            self.model_store.save(model_dir, lda_model, dictionary, doc_hashes, 
+                                  self.pruned_tokens, self.model_key)
+            print(f"LDA模型和词典已保存到: {model_dir}")
+        except Exception as e:
+            print(f"保存LDA模型时出错: {str(e)}")
+    
+    def sweep_topics(self, 
+                     corpus: Iterable[List[Tuple[int, int]]], 
+                     dictionary: corpora.Dictionary
+                     ) -> Tuple[pd.DataFrame, models.LdaModel, int]:
+        """
+        在多个进程中并行训练不同主题数的模型，按一致性选出最佳模型
+        
+        语料只序列化一次为 MmCorpus，各子进程按路径读取；候选主题数范围由
+        ANALYSIS.TOPIC_SWEEP 的 MIN/MAX/STEP 指定。u_mass 一致性越高（越接近0）越好，
+        困惑度仅作参考。不修改 self.num_topics（增量训练仍按配置的主题数判断）。
+        
+        Returns:
+            (各主题数的评分对比表, 最佳模型, 选出的主题数)
+        """
+        candidates = list(range(self.sweep_config.get('MIN', 3),
+                                self.sweep_config.get('MAX', 10) + 1,
+                                self.sweep_config.get('STEP', 1)))
+        workers = min(self.sweep_config.get('WORKERS') or os.cpu_count() or 1, 
+                      len(candidates))
+        print(f"开始扫描主题数 {candidates}，工作进程数: {workers}")
+        
+        with tempfile.TemporaryDirectory(prefix='lda_sweep_') as work_dir:
+            # 已是 MmCorpus 时直接复用其文件，否则序列化一次
+            corpus_path = getattr(corpus, 'input', None)
+            if not isinstance(corpus, corpora.MmCorpus) or not corpus_path:
+                corpus_path = str(Path(work_dir) / 'corpus.mm')
+                corpora.MmCorpus.serialize(corpus_path, corpus)
+            dictionary_path = str(Path(work_dir) / 'dictionary.dict')
+            dictionary.save(dictionary_path)
+            
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                rows = list(executor.map(
+                    _train_candidate,
+                    candidates,
+                    [corpus_path] * len(candidates),
+                    [dictionary_path] * len(candidates),
+                    [work_dir] * len(candidates)
+                ))
+                
+            table = pd.DataFrame(rows)
+            best = table.loc[table['一致性(u_mass)'].idxmax()]
+            best_model = models.LdaModel.load(best['model_path'])
+            
+        table = table.drop(columns=['model_path'])
+        best_num_topics = int(best['主题数'])
+        print("主题数扫描结果：")
+        print(table.to_string(index=False))
+        print(f"选择主题数: {best_num_topics}")
+        
+        if self.output_manager:
+            sweep_file = self.output_manager.get_path('topic_sweep.csv', subdir='data')
+            table.to_csv(sweep_file, index=False, encoding='utf-8-sig')
+            print(f"主题数扫描结果已保存到: {sweep_file}")
+            
+        return table, best_model, best_num_topics
+    
+    def _train_lda(self, 
+                   corpus: Iterable[List[Tuple[int, int]]], 
+                   dictionary: corpora.Dictionary,
+                   num_topics: Optional[int] = None) -> models.LdaModel:
+        """
+        按 ANALYSIS.LDA.BACKEND 训练LDA模型
+        
+        single: 单进程 LdaModel，alpha='auto' 会在训练中学习非对称的文档-主题先验。
+        multicore: LdaMulticore，E步在 WORKERS 个进程中并行。LdaMulticore 不支持
+        alpha='auto'，这里使用对称先验 alpha='symmetric'（1/主题数），且为批量更新。
+        因此主题占比更趋均匀，小众主题不易被学出来，结果与单进程模式不会逐项一致。
+        num_topics 为None时使用配置的 TOPIC_COUNT。
+        """
+        num_topics = num_topics or self.num_topics
+        if self.backend == 'multicore':
+            print(f"使用 LdaMulticore 训练，工作进程数: {self.workers}")
+            return models.LdaMulticore(
+                corpus=corpus,
+                id2word=dictionary,
+                num_topics=num_topics,
+                workers=self.workers,
+                random_state=42,
+                chunksize=self.chunksize,
+                passes=self.passes,
+                iterations=self.iterations,
+                alpha='symmetric',
+                per_word_topics=True
+            )
+            
+        return models.LdaModel(
+            corpus=corpus,
+            id2word=dictionary,
+            num_topics=num_topics,
+            random_state=42,
+            update_every=1,
+            chunksize=self.chunksize,
+            passes=self.passes,
+            iterations=self.iterations,
+            alpha='auto',
+            per_word_topics=True
+        )
+    
+    def _infer_doc_topics(self, 
+                          lda_model: models.LdaModel, 
+                          corpus: Iterable[List[Tuple[int, int]]]) -> np.ndarray:
+        """
+        分块批量推断整个语料的文档-主题分布
+        
+        每块调用一次 lda_model.inference，代替逐篇调用 get_document_topics，
+        归一化后的结果与 get_document_topics 一致（未做最小概率截断）。
+        
+        Returns:
+            稠密矩阵 (文档数 x 主题数)
+        """
+        blocks = []
+        for chunk in utils.grouper(corpus, self.chunksize):
+            gamma, _ = lda_model.inference(chunk)
+            blocks.append(gamma)
+        if not blocks:
+            return np.zeros((0, lda_model.num_topics))
+            
+        doc_topics = np.vstack(blocks)
+        doc_topics /= doc_topics.sum(axis=1, keepdims=True)
+        return doc_topics
+    
     def format_results(self, results: TopicAnalysisResult) -> pd.DataFrame:
         """将分析结果格式化为DataFrame"""
         if not results:
             return pd.DataFrame()
             
         formatted_data = []
-        for topic_id in range(self.num_topics):
+        for topic_id in range(len(results.topics)):
             # 格式化主题词和概率
             topic_words = results.topics[topic_id]
             formatted_words = [f"{word} ({prob:.3f})" for word, prob in topic_words]
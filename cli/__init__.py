@@ -0,0 +1,93 @@
+"""
+命令行子命令
+
+    python main.py crawl <商品URL或URL列表文件> [--pages N] [--resume | --fresh]
+    python main.py analyze <评论文件> [--no-wordcloud]
+    python main.py topics <评论文件>
+    python main.py render <lda_visualization.json> [-o 输出HTML]
+    python main.py batch <目录或glob模式>... [--no-wordcloud] [--no-topics]
+
+不带子命令时 main.py 运行原来的交互式完整流程。解析参数只用到标准库；
+每个子命令在 cli/<子命令>.py 中实现，运行该子命令时才导入，只加载它
+需要的依赖（例如 render 不加载 selenium、jieba 和 gensim）。子命令模块
+在 RUNTIME_MODULES 中列出运行时会导入的模块，由 load() 在运行前一次导入；
+各子命令的导入耗时可用 tools/import_report.py 查看。
+"""
+import argparse
+import importlib
+from types import ModuleType
+from typing import List, Optional
+
+# 子命令 -> 说明
+COMMANDS = {
+    'crawl': '爬取商品评论并保存为评论文件',
+    'analyze': '分词、统计词频并生成词云',
+    'topics': '对评论文件进行LDA主题分析',
+    'render': '由保存的可视化JSON生成LDA交互式HTML',
+    'batch': '批量分析已保存的评论文件（每个商品单独输出）',
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog='main.py', description='淘宝评论文本挖掘')
+    subparsers = parser.add_subparsers(dest='command', metavar='<子命令>')
+
+    crawl = subparsers.add_parser('crawl', help=COMMANDS['crawl'])
+    crawl.add_argument('url', help='商品URL，或每行一个URL的列表文件')
+    crawl.add_argument('--pages', type=int, default=None,
+                       help='最多爬取页数，默认使用 CRAWLER.MAX_PAGES')
+    resume = crawl.add_mutually_exclusive_group()
+    resume.add_argument('--resume', action='store_true', help='从上次中断的进度继续，不询问')
+    resume.add_argument('--fresh', action='store_true', help='忽略上次的进度重新爬取，不询问')
+
+    analyze = subparsers.add_parser('analyze', help=COMMANDS['analyze'])
+    analyze.add_argument('comments', type=str, help='评论文件（每行一条评论）')
+    analyze.add_argument('--no-wordcloud', action='store_true', help='只统计词频，不生成词云')
+
+    topics = subparsers.add_parser('topics', help=COMMANDS['topics'])
+    topics.add_argument('comments', type=str, help='评论文件（每行一条评论）')
+
+    render = subparsers.add_parser('render', help=COMMANDS['render'])
+    render.add_argument('vis_json', type=str, help='topics 保存的 lda_visualization.json')
+    render.add_argument('-o', '--output', type=str, default=None,
+                        help='HTML输出路径，默认与JSON在同一目录')
+
+    batch = subparsers.add_parser('batch', help=COMMANDS['batch'])
+    batch.add_argument('inputs', nargs='+',
+                       help='评论文件、目录或glob模式（comments.txt、*.jsonl、product_comments.json）')
+    batch.add_argument('--no-wordcloud', action='store_true', help='不生成词云')
+    batch.add_argument('--no-topics', action='store_true', help='不进行主题分析')
+
+    return parser
+
+
+def load(command: str) -> ModuleType:
+    """
+    导入子命令模块及其运行时会用到的模块（RUNTIME_MODULES）
+    
+    这些模块在子命令内部按需导入；这里在运行前一次导入，缺少依赖时
+    在开始工作前就报错，tools/import_report.py 也据此统计子命令实际加载的模块。
+    
+    Returns:
+        子命令模块
+    """
+    module = importlib.import_module(f'{__name__}.{command}')
+    for name in module.RUNTIME_MODULES:
+        importlib.import_module(name)
+    return module
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    解析参数并运行子命令
+
+    Returns:
+        进程退出码
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    return load(args.command).run(args)
@@ -0,0 +1,42 @@
+"""analyze 子命令：分词、统计词频并生成词云，不加载 selenium、gensim 和 pyLDAvis"""
+from pathlib import Path
+from .common import load_corpus, save_word_freq, setup
+
+# 运行时会导入的模块（见 cli.load）
+RUNTIME_MODULES = ('analysis.text_analyzer', 'analysis.segment_cache', 'jieba', 'pandas',
+                   'visualization.word_cloud', 'wordcloud', 'PIL.Image')
+
+
+def run(args) -> int:
+    from analysis import TextAnalyzer
+    from visualization import WordCloudGenerator
+    
+    output_manager, logger = setup()
+
+    try:
+        analyzer = TextAnalyzer(output_manager)
+        logger.info("开始分析评论...")
+        corpus = load_corpus(analyzer, Path(args.comments))
+        word_freq = analyzer.analyze_comments(corpus)
+        if not word_freq:
+            logger.error("词频分析结果为空", exc_info=False)
+            return 1
+
+        if not args.no_wordcloud:
+            logger.info("正在生成词云...")
+            WordCloudGenerator(output_manager).generate(word_freq)
+
+        logger.info("生成词频统计...")
+        for word, count in word_freq.most_common(20):
+            logger.info(f"{word}: {count}次")
+        freq_file = save_word_freq(output_manager, word_freq)
+        logger.info(f"词频统计已保存到: {freq_file}")
+        output_manager.clean_old_runs()
+        return 0
+
+    except KeyboardInterrupt:
+        logger.warning("程序被用户中断")
+        return 130
+    except Exception as e:
+        logger.error(f"程序执行出错: {str(e)}")
+        return 1
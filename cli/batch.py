@@ -0,0 +1,244 @@
+"""
+batch 子命令：批量分析已保存的评论文件，不启动浏览器
+
+在一个进程中依次分析多个商品：jieba 词典、停用词、分词缓存、词云生成器
+和渲染进程池只加载一次。每个商品的结果写入批次目录下自己的运行目录：
+
+    output/<时间戳>_batch/<商品名>/{data,visualization,models}
+    output/<时间戳>_batch/data/batch_summary.csv   每个商品的评论数、耗时和输出目录
+
+支持的输入（目录、文件或 glob 模式）：
+    comments.txt 等文本文件   每行一条评论
+    *.jsonl                   每行一条评论：字符串，或带 text 字段的对象
+                              （如爬取进度目录中的 reviews.jsonl）
+    product_comments.json     多商品爬取保存的 {商品URL: [评论, ...]}，每个商品单独分析
+"""
+import glob
+import json
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple, Union
+from crawler.checkpoint import CrawlCheckpoint
+from utils import config
+from utils.output_manager import OutputManager
+from .common import (load_corpus, product_key, save_comments, save_topics, save_word_freq,
+                     setup, source_key)
+
+if TYPE_CHECKING:
+    from analysis import TextAnalyzer
+    from visualization import RenderPool, WordCloudGenerator
+
+# 运行时会导入的模块（见 cli.load）
+RUNTIME_MODULES = ('analysis.text_analyzer', 'analysis.segment_cache', 'jieba',
+                   'analysis.topic_analyzer', 'gensim', 'pandas', 'pyLDAvis',
+                   'visualization.word_cloud', 'wordcloud', 'PIL.Image')
+
+PRODUCT_COMMENTS_FILE = 'product_comments.json'
+SOURCE_SUFFIXES = ('.txt', '.jsonl', '.json')
+
+# 这些文件名不能区分商品，改用所在目录（跳过 data 子目录）命名
+_GENERIC_STEMS = {'comments', 'reviews'}
+_GENERIC_DIRS = {'data'}
+
+
+def find_sources(inputs: List[str]) -> List[Path]:
+    """
+    展开目录和 glob 模式，返回评论文件列表
+
+    目录中递归查找评论文件（OUTPUT.FILE_NAMES.COMMENTS）、*.jsonl 和
+    product_comments.json。同一目录下有 product_comments.json 时，
+    其中合并保存的 comments.txt 不再重复分析。
+    """
+    comments_name = config.get('OUTPUT.FILE_NAMES.COMMENTS', 'comments.txt')
+    sources = set()
+    for pattern in inputs:
+        path = Path(pattern)
+        if path.is_dir():
+            for name in (comments_name, '*.jsonl', PRODUCT_COMMENTS_FILE):
+                sources.update(path.rglob(name))
+        else:
+            sources.update(Path(p) for p in glob.glob(pattern, recursive=True))
+
+    sources = {p for p in sources if p.is_file() and p.suffix in SOURCE_SUFFIXES}
+    merged = {p.parent for p in sources if p.name == PRODUCT_COMMENTS_FILE}
+    return sorted(p for p in sources
+                  if not (p.name == comments_name and p.parent in merged))
+
+
+def _source_name(path: Path) -> str:
+    """评论文件对应的商品名称"""
+    if path.stem not in _GENERIC_STEMS:
+        return path.stem
+
+    # 爬取进度目录：用检查点记录的商品URL命名
+    state_path = path.parent / CrawlCheckpoint.STATE_FILE
+    if state_path.exists():
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                return product_key(json.load(f)['url'])
+        except (ValueError, KeyError, OSError):
+            pass
+
+    parent = path.parent
+    if parent.name in _GENERIC_DIRS:
+        parent = parent.parent
+    return parent.name or path.stem
+
+
+def _read_jsonl(path: Path) -> List[str]:
+    """读取JSONL评论文件，跳过无法解析的行"""
+    comments = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            text = record.get('text') if isinstance(record, dict) else record
+            if isinstance(text, str) and text.strip():
+                comments.append(text.strip())
+    return comments
+
+
+def load_products(source: Path) -> List[Tuple[str, str, Union[Path, List[str]]]]:
+    """
+    读取评论文件中的商品
+
+    Returns:
+        (商品名称, 模型标识, 评论) 列表；模型标识用于增量训练时只复用同一商品的模型，
+        JSON 中的商品使用商品id，其他使用评论文件路径；
+        文本文件的评论为文件路径（可流式读取），其他为评论列表
+    """
+    if source.suffix == '.json':
+        with open(source, 'r', encoding='utf-8') as f:
+            product_comments = json.load(f)
+        if not isinstance(product_comments, dict):
+            raise ValueError("不是 {商品URL: [评论, ...]} 格式")
+        return [(product_key(url), product_key(url),
+                 [c for c in comments if isinstance(c, str) and c.strip()])
+                for url, comments in product_comments.items()]
+    if source.suffix == '.jsonl':
+        return [(_source_name(source), source_key(source), _read_jsonl(source))]
+    return [(_source_name(source), source_key(source), source)]
+
+
+def _unique_name(name: str, used: Set[str]) -> str:
+    """把名称转换为可用作目录名的形式，重名时加序号"""
+    name = re.sub(r'[^\w.-]+', '_', name).strip('._') or 'product'
+    unique, index = name, 2
+    while unique in used:
+        unique = f'{name}_{index}'
+        index += 1
+    used.add(unique)
+    return unique
+
+
+def analyze_product(comments: Union[Path, List[str]],
+                    model_key: str,
+                    output_manager: OutputManager,
+                    analyzer: 'TextAnalyzer',
+                    word_cloud: 'WordCloudGenerator',
+                    render_pool: 'RenderPool',
+                    args) -> Dict:
+    """
+    分析一个商品的评论，结果写入该商品的运行目录
+
+    Returns:
+        汇总信息（有效评论数、词语数、主题分析是否完成）
+    """
+    analyzer.set_output_manager(output_manager)
+    analyzer.set_model_key(model_key)
+    word_cloud.output_manager = output_manager
+
+    if isinstance(comments, Path):
+        corpus = load_corpus(analyzer, comments)
+    else:
+        # 来自JSON的评论另存为 comments.txt，便于之后单独重新分析
+        save_comments(output_manager, comments)
+        corpus = analyzer.build_corpus(comments)
+
+    row = {'有效评论数': len(corpus), '词语数': 0, '主题分析': '-'}
+    word_freq = analyzer.analyze_comments(corpus)
+    if not word_freq:
+        return row
+    row['词语数'] = len(word_freq)
+    save_word_freq(output_manager, word_freq)
+
+    if not args.no_wordcloud:
+        word_cloud.submit(render_pool, word_freq)
+
+    if not args.no_topics:
+        topic_df = analyzer.analyze_topics(corpus)
+        if not topic_df.empty:
+            save_topics(output_manager, topic_df)
+            row['主题分析'] = '完成'
+        else:
+            row['主题分析'] = '失败'
+    return row
+
+
+def run(args) -> int:
+    import pandas as pd
+    from analysis import TextAnalyzer
+    from visualization import RenderPool, WordCloudGenerator
+    
+    sources = find_sources(args.inputs)
+    if not sources:
+        print("没有找到评论文件")
+        return 1
+
+    batch_output, logger = setup(run_name=datetime.now().strftime('%Y%m%d_%H%M%S') + '_batch')
+    logger.info(f"找到 {len(sources)} 个评论文件，结果保存到: {batch_output.run_dir}")
+
+    render_pool = RenderPool()
+    analyzer = TextAnalyzer(batch_output, render_pool)
+    word_cloud = WordCloudGenerator(batch_output)
+    # 批次目录自身的子目录名不能用作商品名
+    used_names: Set[str] = {'data', 'visualization', 'logs'}
+    summary = []
+    started = time.time()
+
+    try:
+        for source in sources:
+            try:
+                products = load_products(source)
+            except Exception as e:
+                logger.error(f"读取 {source} 出错: {str(e)}", exc_info=False)
+                continue
+
+            for name, model_key, comments in products:
+                name = _unique_name(name, used_names)
+                logger.info(f"[{len(summary) + 1}] 分析 {name}（{source}）")
+                product_started = time.time()
+                output_manager = OutputManager(run_name=f'{batch_output.run_dir.name}/{name}')
+                try:
+                    row = analyze_product(comments, model_key, output_manager, analyzer,
+                                          word_cloud, render_pool, args)
+                    row['状态'] = '完成' if row['词语数'] else '无有效评论'
+                except Exception as e:
+                    logger.error(f"分析 {name} 出错: {str(e)}")
+                    row = {'状态': '失败'}
+                elapsed = round(time.time() - product_started, 2)
+                summary.append({'商品': name, '来源': str(source), **row,
+                                '耗时(秒)': elapsed, '输出目录': str(output_manager.run_dir)})
+                logger.info(f"{name} 用时 {elapsed} 秒")
+
+        # 等待图表渲染完成
+        render_pool.wait()
+
+    except KeyboardInterrupt:
+        logger.warning("程序被用户中断")
+    finally:
+        render_pool.close()
+
+    summary_file = batch_output.get_path('batch_summary.csv',
+                                         subdir=config.get('OUTPUT.SUBDIRS.DATA', 'data'))
+    pd.DataFrame(summary).to_csv(summary_file, index=False, encoding='utf-8-sig')
+    done = sum(1 for row in summary if row['状态'] == '完成')
+    failed = sum(1 for row in summary if row['状态'] == '失败')
+    logger.info(f"批量分析完成：{done}/{len(summary)} 个商品，"
+                f"共用时 {time.time() - started:.1f} 秒，汇总已保存到: {summary_file}")
+    batch_output.clean_old_runs()
+    return 1 if failed else 0
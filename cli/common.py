@@ -0,0 +1,113 @@
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Tuple
+from urllib.parse import parse_qs, urlparse
+from crawler.checkpoint import CrawlCheckpoint
+from utils import config
+from utils.log_manager import LogManager
+from utils.output_manager import OutputManager
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from crawler import TaobaoCommentCrawler
+
+
+def validate_config():
+    """验证配置是否有效"""
+    required_configs = [
+        'CRAWLER.MAX_PAGES',
+        'CRAWLER.WAIT_TIME',
+        'CRAWLER.LOGIN_TIMEOUT',
+        'VISUALIZATION.WORDCLOUD',
+        'OUTPUT.BASE_DIR',
+        'OUTPUT.KEEP_RUNS',
+        'OUTPUT.SUBDIRS',
+        'OUTPUT.FILE_NAMES'
+    ]
+
+    missing_configs = []
+    for key in required_configs:
+        if config.get(key) is None:
+            missing_configs.append(key)
+
+    if missing_configs:
+        raise ValueError(f"缺少必要的配置项: {', '.join(missing_configs)}")
+
+
+def ask_resume(crawler: 'TaobaoCommentCrawler', product_urls) -> bool:
+    """有上次中断留下的爬取进度时询问是否继续"""
+    checkpoints = [crawler.get_checkpoint(url) for url in product_urls]
+    pages_done = sum(checkpoint.pages_done for checkpoint in checkpoints
+                     if checkpoint is not None)
+    if pages_done == 0:
+        return False
+    answer = input(f"\n发现上次的爬取进度（已爬取 {pages_done} 页），是否继续？(y/n)：")
+    return answer.strip().lower() in ('y', 'yes', '是')
+
+
+def product_key(product_url: str) -> str:
+    """商品URL对应的名称：优先使用商品id，也用作增量训练的模型标识"""
+    item_id = parse_qs(urlparse(product_url).query).get('id')
+    if item_id:
+        return f'item_{item_id[0]}'
+    return f'item_{CrawlCheckpoint.url_key(product_url)}'
+
+
+def source_key(path: Path) -> str:
+    """评论文件（或URL列表文件）对应的模型标识：文件的绝对路径"""
+    return str(Path(path).resolve())
+
+
+def setup(run_name: str = None) -> Tuple[OutputManager, LogManager]:
+    """验证配置，创建本次运行的输出目录（默认以时间戳命名）和日志"""
+    validate_config()
+    output_manager = OutputManager(run_name=run_name)
+    return output_manager, LogManager(output_manager)
+
+
+def data_path(output_manager: OutputManager, name_key: str, default: str) -> Path:
+    """运行目录 data 子目录下的输出文件路径，文件名取自 OUTPUT.FILE_NAMES"""
+    return output_manager.get_path(
+        config.get(f'OUTPUT.FILE_NAMES.{name_key}', default),
+        subdir=config.get('OUTPUT.SUBDIRS.DATA', 'data')
+    )
+
+
+def read_comments(path: Path) -> List[str]:
+    """读取评论文件（每行一条评论），跳过空行"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def load_corpus(analyzer, comments_path: Path):
+    """读取评论文件并分词，开启流式分析时流式构建语料"""
+    if config.get('ANALYSIS.STREAMING.ENABLED', False):
+        return analyzer.build_streamed_corpus(comments_path)
+    return analyzer.build_corpus(read_comments(comments_path))
+
+
+def save_comments(output_manager: OutputManager, comments: List[str]) -> Path:
+    """保存评论数据（每行一条评论，流式分析直接读取该文件）"""
+    comments_file = data_path(output_manager, 'COMMENTS', 'comments.txt')
+    with open(comments_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(comment.replace('\n', ' ') for comment in comments))
+    return comments_file
+
+
+def save_word_freq(output_manager: OutputManager, word_freq: Counter) -> Path:
+    """保存词频统计"""
+    import pandas as pd
+
+    freq_file = data_path(output_manager, 'WORD_FREQ', 'word_frequencies.csv')
+    pd.DataFrame(word_freq.most_common(),
+                 columns=['词语', '频次']).to_csv(freq_file,
+                                              index=False,
+                                              encoding='utf-8-sig')
+    return freq_file
+
+
+def save_topics(output_manager: OutputManager, topic_df: 'pd.DataFrame') -> Path:
+    """保存主题分析结果"""
+    topic_file = data_path(output_manager, 'TOPIC_ANALYSIS', 'topic_analysis.csv')
+    topic_df.to_csv(topic_file, index=False, encoding='utf-8-sig')
+    return topic_file
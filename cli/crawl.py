@@ -0,0 +1,72 @@
+"""crawl 子命令：爬取商品评论并保存为评论文件，只加载 selenium 和爬虫模块"""
+import json
+from pathlib import Path
+from utils import config
+from .common import ask_resume, save_comments, setup
+
+# 运行时会导入的模块（见 cli.load）
+RUNTIME_MODULES = ('crawler.taobao_crawler', 'crawler.crawler_pool', 'selenium.webdriver')
+
+
+def run(args) -> int:
+    from crawler import CrawlerPool, TaobaoCommentCrawler
+    
+    output_manager, logger = setup()
+    crawler = None
+    pool = None
+
+    try:
+        crawler = TaobaoCommentCrawler()
+        logger.info("开始登录淘宝...")
+        crawler.login()
+
+        url_list = Path(args.url).is_file()
+        if url_list:
+            product_urls = CrawlerPool.load_urls(args.url)
+        else:
+            product_urls = [args.url]
+
+        # 命令行指定时不询问，便于定时任务无人值守运行
+        if args.resume or args.fresh:
+            resume = args.resume
+        else:
+            resume = ask_resume(crawler, product_urls)
+
+        logger.info("开始爬取评论...")
+        if url_list:
+            # 多商品：浏览器池并发爬取，复用已登录的驱动
+            logger.info(f"使用浏览器池爬取 {len(product_urls)} 个商品")
+            pool = CrawlerPool(seed_crawler=crawler)
+            product_comments = pool.crawl(product_urls, pages=args.pages, resume=resume)
+            product_file = output_manager.get_path(
+                'product_comments.json',
+                subdir=config.get('OUTPUT.SUBDIRS.DATA', 'data')
+            )
+            with open(product_file, 'w', encoding='utf-8') as f:
+                json.dump(product_comments, f, ensure_ascii=False, indent=2)
+            logger.info(f"各商品评论已保存到: {product_file}")
+            comments = [comment for url_comments in product_comments.values()
+                        for comment in url_comments]
+        else:
+            crawler.get_comments(product_urls[0], pages=args.pages, resume=resume)
+            comments = crawler.get_all_comments()
+
+        if not comments:
+            logger.error("未获取到任何评论", exc_info=False)
+            return 1
+        comments_file = save_comments(output_manager, comments)
+        logger.info(f"成功获取 {len(comments)} 条评论，已保存到: {comments_file}")
+        output_manager.clean_old_runs()
+        return 0
+
+    except KeyboardInterrupt:
+        logger.warning("程序被用户中断")
+        return 130
+    except Exception as e:
+        logger.error(f"程序执行出错: {str(e)}")
+        return 1
+    finally:
+        if pool:
+            pool.close()
+        elif crawler:
+            crawler.close()
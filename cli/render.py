@@ -0,0 +1,25 @@
+"""render 子命令：由保存的可视化JSON生成LDA交互式HTML，只加载 pyLDAvis"""
+from pathlib import Path
+from utils import config
+
+# 运行时会导入的模块（见 cli.load）
+RUNTIME_MODULES = ('visualization.topic_visualizer', 'pyLDAvis')
+
+
+def run(args) -> int:
+    from visualization.topic_visualizer import TopicVisualizer
+    
+    vis_json = Path(args.vis_json)
+    if not vis_json.is_file():
+        print(f"找不到可视化数据文件: {vis_json}")
+        return 1
+
+    html_path = Path(args.output) if args.output else vis_json.with_name(
+        config.get('OUTPUT.FILE_NAMES.LDA_VIS', 'lda_visualization.html'))
+    try:
+        TopicVisualizer.render_html(vis_json, html_path)
+    except Exception as e:
+        print(f"生成LDA可视化HTML时出错: {str(e)}")
+        return 1
+    print(f"LDA可视化结果已保存到: {html_path}")
+    return 0
@@ -0,0 +1,43 @@
+"""topics 子命令：对评论文件进行LDA主题分析，不加载 selenium 和 wordcloud"""
+from pathlib import Path
+from .common import load_corpus, save_topics, setup, source_key
+
+# 运行时会导入的模块（见 cli.load）；主题分析器由 TextAnalyzer 按需创建
+RUNTIME_MODULES = ('analysis.text_analyzer', 'analysis.segment_cache', 'jieba',
+                   'analysis.topic_analyzer', 'gensim', 'pandas', 'pyLDAvis')
+
+
+def run(args) -> int:
+    from analysis import TextAnalyzer
+    from visualization import RenderPool
+    
+    output_manager, logger = setup()
+    render_pool = RenderPool()
+
+    try:
+        analyzer = TextAnalyzer(output_manager, render_pool,
+                                model_key=source_key(args.comments))
+        logger.info("开始主题分析...")
+        corpus = load_corpus(analyzer, Path(args.comments))
+        topic_df = analyzer.analyze_topics(corpus)
+        if topic_df.empty:
+            logger.error("主题分析结果为空", exc_info=False)
+            return 1
+
+        logger.info("\n主题分析结果：\n" + topic_df.to_string(index=False))
+        topic_file = save_topics(output_manager, topic_df)
+        logger.info(f"主题分析结果已保存到: {topic_file}")
+
+        # 等待图表渲染完成
+        render_pool.wait()
+        output_manager.clean_old_runs()
+        return 0
+
+    except KeyboardInterrupt:
+        logger.warning("程序被用户中断")
+        return 130
+    except Exception as e:
+        logger.error(f"程序执行出错: {str(e)}")
+        return 1
+    finally:
+        render_pool.close()
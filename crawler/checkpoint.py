@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+class CrawlCheckpoint:
+    """
+    单个商品的爬取进度
+
+    每页评论爬到后立即追加写入 JSONL 文件（每行一条评论，带页码），
+    再更新检查点（已完成页数）。程序中断后可据此恢复已爬取的评论，
+    并跳过已爬取的页面继续爬取。
+    """
+
+    REVIEWS_FILE = 'reviews.jsonl'
+    STATE_FILE = 'checkpoint.json'
+
+    def __init__(self, base_dir: Path, product_url: str):
+        """
+        Args:
+            base_dir: 爬取进度根目录，每个商品一个以URL哈希命名的子目录
+            product_url: 商品URL
+        """
+        self.product_url = product_url
+        self.state_dir = Path(base_dir) / self.url_key(product_url)
+        self.reviews_path = self.state_dir / self.REVIEWS_FILE
+        self.state_path = self.state_dir / self.STATE_FILE
+
+    @staticmethod
+    def url_key(product_url: str) -> str:
+        """商品URL对应的目录名"""
+        return hashlib.sha1(product_url.strip().encode('utf-8')).hexdigest()[:16]
+
+    def _read_state(self) -> Dict:
+        """读取检查点，不存在或损坏时返回空检查点"""
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"读取爬取进度出错: {str(e)}")
+            return {}
+
+    def _write_state(self, pages_done: int, finished: bool = False):
+        """写入检查点（先写临时文件再替换，避免中断时损坏）"""
+        state = {
+            'url': self.product_url,
+            'pages_done': pages_done,
+            'finished': finished,
+            'updated_at': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.state_path)
+
+    @property
+    def pages_done(self) -> int:
+        """已完成的页数"""
+        return self._read_state().get('pages_done', 0)
+
+    @property
+    def finished(self) -> bool:
+        """上次爬取是否已正常结束"""
+        return self._read_state().get('finished', False)
+
+    def exists(self) -> bool:
+        """是否有可恢复的进度"""
+        return self.pages_done > 0
+
+    def load(self) -> Tuple[int, List[Dict]]:
+        """
+        读取已爬取的评论
+
+        只保留检查点记录的页码以内的评论：写入评论后、更新检查点前中断时，
+        该页会在恢复后重新爬取。文件末尾不完整的行被丢弃，
+        整理后的内容写回文件，后续继续追加。
+
+        Returns:
+            (已完成页数, 评论字典列表)
+        """
+        pages_done = self.pages_done
+        if pages_done == 0 or not self.reviews_path.exists():
+            return 0, []
+
+        lines = []
+        reviews = []
+        with open(self.reviews_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('page', 0) > pages_done:
+                    continue
+                lines.append(json.dumps(record, ensure_ascii=False))
+                record.pop('page', None)
+                reviews.append(record)
+
+        tmp_path = self.reviews_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(line + '\n' for line in lines)
+        tmp_path.replace(self.reviews_path)
+        return pages_done, reviews
+
+    def reset(self):
+        """清除已有进度，重新开始"""
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        for path in (self.reviews_path, self.state_path):
+            if path.exists():
+                path.unlink()
+
+    def append_page(self, page: int, reviews: List[Dict]):
+        """
+        追加一页评论并更新检查点
+
+        Args:
+            page: 页码（从1开始）
+            reviews: 该页的评论字典列表
+        """
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.reviews_path, 'a', encoding='utf-8') as f:
+            for review in reviews:
+                f.write(json.dumps(dict(review, page=page), ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._write_state(page)
+
+    def mark_finished(self):
+        """标记爬取已正常结束"""
+        self._write_state(self.pages_done, finished=True)
@@ -0,0 +1,139 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from queue import Queue
+from typing import Callable, Dict, Iterable, List, Optional, Union
+from utils import config
+from .taobao_crawler import TaobaoCommentCrawler
+
+
+class CrawlerPool:
+    """浏览器池，管理多个Chrome驱动并发爬取多个商品的评论"""
+
+    def __init__(self, size: int = None, seed_crawler: Optional[TaobaoCommentCrawler] = None):
+        """
+        Args:
+            size: 驱动数量，默认使用 CRAWLER.POOL.SIZE
+            seed_crawler: 已登录的爬虫，加入池中并作为登录状态的来源
+        """
+        pool_config = config.get('CRAWLER.POOL', {})
+        self.size = size or pool_config.get('SIZE', 3)
+        self.seed_crawler = seed_crawler
+        self.crawlers: List[TaobaoCommentCrawler] = []
+        self._idle: Queue = Queue()
+
+    @staticmethod
+    def load_urls(source: Union[str, Path, Iterable[str]]) -> List[str]:
+        """
+        读取商品URL列表
+
+        Args:
+            source: URL列表，或每行一个URL的文件路径（忽略空行和#开头的注释）
+        """
+        if isinstance(source, (str, Path)):
+            with open(source, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        else:
+            lines = list(source)
+
+        urls = []
+        for line in lines:
+            url = line.strip()
+            if url and not url.startswith('#') and url not in urls:
+                urls.append(url)
+        return urls
+
+    def start(self):
+        """启动驱动；有种子爬虫时复用它，并把它的登录状态同步给其他驱动"""
+        if self.seed_crawler is not None:
+            self.crawlers.append(self.seed_crawler)
+
+        # 浏览器用户目录不能被多个Chrome同时使用，其他驱动通过同步Cookie共享登录状态
+        while len(self.crawlers) < self.size:
+            self.crawlers.append(TaobaoCommentCrawler(persistent_profile=len(self.crawlers) == 0))
+
+        if self.seed_crawler is not None:
+            self.share_login(self.seed_crawler)
+
+        for crawler in self.crawlers:
+            self._idle.put(crawler)
+        print(f"浏览器池已启动，共 {len(self.crawlers)} 个驱动")
+
+    def login(self):
+        """由第一个驱动完成登录，再把登录状态同步给其他驱动"""
+        if not self.crawlers:
+            self.start()
+        source = self.crawlers[0]
+        source.login()
+        self.share_login(source)
+
+    def share_login(self, source: TaobaoCommentCrawler):
+        """把源驱动的Cookie复制到池中其他驱动"""
+        cookies = source.driver.get_cookies()
+        for crawler in self.crawlers:
+            if crawler is source:
+                continue
+            try:
+                crawler.load_cookies(cookies)
+            except Exception as e:
+                print(f"同步登录状态失败: {str(e)}")
+
+    def _crawl_one(self, 
+                   product_url: str, 
+                   pages: int = None, 
+                   resume: bool = False,
+                   on_page: Optional[Callable[[List[Dict]], None]] = None) -> List[str]:
+        """从池中取一个空闲驱动爬取单个商品"""
+        crawler = self._idle.get()
+        try:
+            crawler.comments = []
+            crawler.reviews = []
+            crawler.get_comments(product_url, pages, resume=resume, on_page=on_page)
+            return list(crawler.get_all_comments())
+        finally:
+            self._idle.put(crawler)
+
+    def crawl(self,
+              product_urls: Iterable[str],
+              pages: int = None,
+              resume: bool = False,
+              on_page: Optional[Callable[[List[Dict]], None]] = None) -> Dict[str, List[str]]:
+        """
+        并发爬取多个商品
+
+        每个驱动同时只处理一个商品，驱动的每次页面请求（打开页面、刷新、
+        全部评价和翻页点击）之间至少间隔 MIN_REQUEST_INTERVAL 秒；
+        random_sleep 只在某一页未找到评论重试前调用。
+        resume 为 True 时每个商品从各自上次中断处继续。
+        on_page 会被多个驱动线程同时调用，需要是线程安全的。
+
+        Returns:
+            商品URL到评论列表的映射，顺序与输入一致
+        """
+        if not self.crawlers:
+            self.start()
+
+        product_urls = list(product_urls)
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(self.crawlers)) as executor:
+            futures = {executor.submit(self._crawl_one, url, pages, resume, on_page): url
+                       for url in product_urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    results[url] = future.result()
+                except Exception as e:
+                    print(f"爬取商品出错 {url}: {str(e)}")
+                    results[url] = []
+                print(f"商品完成 ({len(results)}/{len(product_urls)}): "
+                      f"{url}，{len(results[url])} 条评论")
+
+        return {url: results[url] for url in product_urls}
+
+    def close(self):
+        """关闭池中所有驱动"""
+        for crawler in self.crawlers:
+            try:
+                crawler.close()
+            except Exception as e:
+                print(f"关闭浏览器出错: {str(e)}")
+        self.crawlers = []
@@ -0,0 +1,303 @@
+import hashlib
+import re
+import struct
+import threading
+import unicodedata
+import zlib
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# 系统默认评价，不含任何评价信息
+PLACEHOLDER_TEXTS = (
+    '此用户没有填写评价',
+    '该用户未填写评价',
+    '该用户未及时主动评价系统默认好评',
+    '评价方未及时做出评价系统默认好评',
+    '系统默认评论',
+    '系统默认好评',
+    '用户未填写评价内容',
+)
+
+# 归一化时去掉的字符：空白、标点和符号
+_NOISE_PATTERN = re.compile(r'[\s\W_]+', re.UNICODE)
+
+# MinHash 使用的大素数（略大于 2^32，保证 a*h+b 不超出 uint64）
+_MINHASH_PRIME = np.uint64(4294967311)
+
+
+def normalize_text(text: str) -> str:
+    """归一化评论文本：全半角统一、转小写、去掉空白和标点"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    return _NOISE_PATTERN.sub('', text)
+
+
+_PLACEHOLDERS = frozenset(normalize_text(text) for text in PLACEHOLDER_TEXTS)
+
+
+def text_hash(normalized: str) -> bytes:
+    """归一化文本的8字节哈希"""
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
+
+
+class BloomFilter:
+    """
+    持久化的布隆过滤器
+
+    用于跨运行去重：只需固定大小的位数组，不保存评论本身。
+    存在一定误判率（把新评论当作重复），由 error_rate 控制。
+    """
+
+    _instances: Dict[str, 'BloomFilter'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: Path, capacity: int = 1000000, error_rate: float = 0.001):
+        """
+        Args:
+            path: 位数组文件路径
+            capacity: 预计元素数量
+            error_rate: 期望误判率
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.num_bits = max(8, int(-capacity * np.log(error_rate) / (np.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * np.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self._load()
+
+    @classmethod
+    def shared(cls, path: Path, capacity: int = 1000000, error_rate: float = 0.001) -> 'BloomFilter':
+        """同一文件在进程内共享一个实例（浏览器池的多个驱动共用）"""
+        key = str(Path(path).resolve())
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(path, capacity, error_rate)
+            return cls._instances[key]
+
+    def _load(self):
+        """读取位数组文件，参数不一致或文件损坏时从空过滤器开始"""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                num_bits, num_hashes = struct.unpack('<QI', f.read(12))
+                bits = f.read()
+            if len(bits) == (num_bits + 7) // 8:
+                self.num_bits, self.num_hashes = num_bits, num_hashes
+                self.bits = bytearray(bits)
+            else:
+                print(f"去重过滤器文件已损坏，重新开始: {self.path}")
+        except Exception as e:
+            print(f"读取去重过滤器出错: {str(e)}")
+
+    def _positions(self, key: bytes) -> List[int]:
+        """双重哈希计算 num_hashes 个位置"""
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def add(self, key: bytes):
+        """加入一个元素"""
+        with self._lock:
+            for pos in self._positions(key):
+                self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def save(self):
+        """写入位数组文件（先写临时文件再替换，避免中断时损坏）"""
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix('.tmp')
+                with open(tmp_path, 'wb') as f:
+                    f.write(struct.pack('<QI', self.num_bits, self.num_hashes))
+                    f.write(self.bits)
+                tmp_path.replace(self.path)
+        except Exception as e:
+            print(f"保存去重过滤器出错: {str(e)}")
+
+
+class MinHashLSH:
+    """基于 MinHash 签名和 LSH 分桶的近似重复检测"""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16,
+                 shingle_size: int = 2):
+        """
+        Args:
+            threshold: 估计的 Jaccard 相似度达到该值即视为近似重复
+            num_perm: MinHash 签名长度
+            bands: LSH 分段数，需整除 num_perm
+            shingle_size: 字符 n-gram 长度
+        """
+        if num_perm % bands:
+            raise ValueError("NUM_PERM 必须是 BANDS 的整数倍")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(1)
+        self._a = rng.randint(1, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+        self._buckets = defaultdict(list)
+        self._signatures: List[np.ndarray] = []
+
+    def signature(self, normalized: str) -> np.ndarray:
+        """计算文本的 MinHash 签名"""
+        size = self.shingle_size
+        shingles = {normalized[i:i + size] for i in range(max(1, len(normalized) - size + 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None])
+                % _MINHASH_PRIME).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def is_duplicate(self, normalized: str) -> bool:
+        """与已加入的文本近似重复时返回True，否则加入索引并返回False"""
+        signature = self.signature(normalized)
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+        for index in candidates:
+            if np.mean(self._signatures[index] == signature) >= self.threshold:
+                return True
+
+        index = len(self._signatures)
+        self._signatures.append(signature)
+        for key in self._band_keys(signature):
+            self._buckets[key].append(index)
+        return False
+
+
+class ReviewDeduplicator:
+    """
+    单个商品的评论去重
+
+    依次经过以下阶段，并分别统计丢弃的数量：
+    默认评价过滤、评论ID去重、跨运行布隆过滤器去重（可选）、
+    归一化文本精确去重和 MinHash 近似去重（可选）。
+    跨运行去重紧接在ID去重之后，已爬取过的评论不再计算 MinHash；
+    评论通过全部阶段被保留时才加入布隆过滤器。
+    """
+
+    STAGES = ('placeholder', 'id', 'cross_run', 'exact', 'near')
+    STAGE_NAMES = {
+        'placeholder': '默认评价',
+        'id': '评论ID重复',
+        'exact': '文本重复',
+        'near': '近似重复',
+        'cross_run': '历史运行已爬取',
+    }
+
+    def __init__(self, product_url: str, dedup_config: Dict, cache_dir: Path):
+        """
+        Args:
+            product_url: 商品URL，跨运行去重按商品区分
+            dedup_config: CRAWLER.DEDUP 配置
+            cache_dir: 布隆过滤器文件所在目录
+        """
+        self.drop_placeholders = dedup_config.get('DROP_PLACEHOLDERS', True)
+        self.product_key = hashlib.sha1(product_url.strip().encode('utf-8')).digest()[:8]
+
+        near_config = dedup_config.get('NEAR_DUPLICATE', {})
+        self.near = None
+        if near_config.get('ENABLED', False):
+            self.near = MinHashLSH(
+                threshold=near_config.get('THRESHOLD', 0.8),
+                num_perm=near_config.get('NUM_PERM', 64),
+                bands=near_config.get('BANDS', 16)
+            )
+
+        cross_config = dedup_config.get('CROSS_RUN', {})
+        self.bloom: Optional[BloomFilter] = None
+        if cross_config.get('ENABLED', False):
+            self.bloom = BloomFilter.shared(
+                Path(cache_dir) / cross_config.get('FILE', 'review_bloom.bin'),
+                capacity=cross_config.get('CAPACITY', 1000000),
+                error_rate=cross_config.get('ERROR_RATE', 0.001)
+            )
+
+        self._seen_ids = set()
+        self._seen_texts = set()
+        self.stats = OrderedDict((stage, 0) for stage in self.STAGES)
+        self.stats['kept'] = 0
+
+    def _bloom_key(self, review: Dict, digest: bytes) -> bytes:
+        """跨运行去重的键：商品 + 评论ID（没有ID时用文本哈希）"""
+        review_id = str(review.get('id') or '')
+        return self.product_key + (review_id.encode('utf-8') if review_id else digest)
+
+    def remember(self, reviews: Iterable[Dict]):
+        """把已保留的评论（如恢复的进度）加入本次运行的去重集合，不做过滤"""
+        for review in reviews:
+            normalized = normalize_text(review.get('text', ''))
+            if review.get('id'):
+                self._seen_ids.add(review['id'])
+            self._seen_texts.add(text_hash(normalized))
+            if self.near is not None and normalized:
+                self.near.is_duplicate(normalized)
+
+    def _drop_stage(self, review: Dict) -> Optional[str]:
+        """返回评论被丢弃的阶段，保留时返回None并登记该评论"""
+        normalized = normalize_text(review.get('text', ''))
+        if not normalized or (self.drop_placeholders and normalized in _PLACEHOLDERS):
+            return 'placeholder'
+
+        review_id = review.get('id')
+        if review_id and review_id in self._seen_ids:
+            return 'id'
+
+        digest = text_hash(normalized)
+        bloom_key = None
+        if self.bloom is not None:
+            bloom_key = self._bloom_key(review, digest)
+            if bloom_key in self.bloom:
+                return 'cross_run'
+
+        if digest in self._seen_texts:
+            return 'exact'
+
+        if self.near is not None and self.near.is_duplicate(normalized):
+            return 'near'
+
+        if bloom_key is not None:
+            self.bloom.add(bloom_key)
+        if review_id:
+            self._seen_ids.add(review_id)
+        self._seen_texts.add(digest)
+        return None
+
+    def filter(self, reviews: Iterable[Dict]) -> List[Dict]:
+        """过滤一页评论，返回去重后的评论"""
+        kept = []
+        for review in reviews:
+            stage = self._drop_stage(review)
+            if stage is None:
+                kept.append(review)
+                self.stats['kept'] += 1
+            else:
+                self.stats[stage] += 1
+        return kept
+
+    @property
+    def dropped(self) -> int:
+        """丢弃的评论总数"""
+        return sum(self.stats[stage] for stage in self.STAGES)
+
+    def report(self) -> str:
+        """各阶段去重统计"""
+        parts = [f"{self.STAGE_NAMES[stage]} {self.stats[stage]}"
+                 for stage in self.STAGES if self.stats[stage]]
+        detail = '，'.join(parts) if parts else '无重复'
+        return f"去重保留 {self.stats['kept']} 条，丢弃 {self.dropped} 条（{detail}）"
+
+    def save(self):
+        """保存跨运行去重的布隆过滤器"""
+        if self.bloom is not None:
+            self.bloom.save()
@@ -0,0 +1,173 @@
+import base64
+import json
+import re
+from typing import Dict, Iterable, List, Optional
+
+# JSONP 响应，如 mtopjsonp3({...})
+JSONP_PATTERN = re.compile(r'^\s*[\w$.]+\s*\((.*)\)\s*;?\s*$', re.S)
+
+# 评论接口中各字段可能使用的键名（淘宝/天猫新旧接口不同）
+TEXT_KEYS = ('rateContent', 'feedback', 'reviewContent', 'appendedFeedback', 'content', 'text')
+ID_KEYS = ('id', 'rateId', 'feedId', 'reviewId')
+RATING_KEYS = ('star', 'rateStar', 'score', 'rating')
+DATE_KEYS = ('rateDate', 'feedbackDate', 'appendedFeedbackDate', 'date', 'createTime', 'gmtCreate')
+SKU_KEYS = ('auctionSku', 'skuValueStr', 'skuInfo', 'skuText', 'sku')
+APPEND_KEYS = ('appendComment', 'appendedFeed', 'append', 'additionalComment')
+
+
+def _first_value(item: Dict, keys: Iterable[str]):
+    """按顺序返回第一个非空字段值"""
+    for key in keys:
+        value = item.get(key)
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+
+def _to_text(value) -> str:
+    """把SKU等可能是字典或列表的字段转换为文本"""
+    if isinstance(value, dict):
+        return ' '.join(str(v) for v in value.values())
+    if isinstance(value, list):
+        return ' '.join(_to_text(v) for v in value)
+    return '' if value is None else str(value)
+
+
+def _to_rating(value) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_review_list(value) -> bool:
+    """判断是否为评论列表：元素为字典且含有评论正文字段"""
+    return bool(isinstance(value, list) and value
+                and all(isinstance(item, dict) for item in value)
+                and any(_first_value(item, TEXT_KEYS) for item in value))
+
+
+def _find_review_lists(obj) -> List[List[Dict]]:
+    """递归查找响应中的评论列表"""
+    if _is_review_list(obj):
+        return [obj]
+    found = []
+    if isinstance(obj, dict):
+        for value in obj.values():
+            found.extend(_find_review_lists(value))
+    elif isinstance(obj, list):
+        for value in obj:
+            found.extend(_find_review_lists(value))
+    return found
+
+
+def _to_records(item: Dict) -> List[Dict]:
+    """把接口中的一条评论转换为与DOM提取一致的记录，追评单独成一条"""
+    text = _to_text(_first_value(item, TEXT_KEYS)).strip()
+    review_id = _to_text(_first_value(item, ID_KEYS))
+    record = {
+        'id': review_id,
+        'text': text,
+        'rating': _to_rating(_first_value(item, RATING_KEYS)),
+        'date': _to_text(_first_value(item, DATE_KEYS)),
+        'sku': _to_text(_first_value(item, SKU_KEYS)),
+        'is_followup': False
+    }
+    records = [record] if text else []
+
+    append = _first_value(item, APPEND_KEYS)
+    if isinstance(append, dict):
+        append_text = _to_text(_first_value(append, TEXT_KEYS)).strip()
+        if append_text:
+            records.append(dict(
+                record,
+                id=f"{review_id}-append" if review_id else '',
+                text=append_text,
+                date=_to_text(_first_value(append, DATE_KEYS)) or record['date'],
+                is_followup=True
+            ))
+    return records
+
+
+def parse_payload(body: str) -> List[Dict]:
+    """
+    解析评论接口的响应体（JSON 或 JSONP），返回评论记录列表
+
+    解析失败或不含评论时返回空列表。
+    """
+    match = JSONP_PATTERN.match(body)
+    if match:
+        body = match.group(1)
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return []
+
+    records = []
+    for review_list in _find_review_lists(payload):
+        for item in review_list:
+            records.extend(_to_records(item))
+    return records
+
+
+class NetworkCapture:
+    """
+    通过 Chrome DevTools Protocol 截获页面自己发出的评论接口响应
+
+    驱动需开启 performance 日志（configure_options），页面加载后调用 drain
+    读取新完成的评论接口响应并解析为评论记录。
+    """
+
+    def __init__(self, url_patterns: List[str]):
+        """
+        Args:
+            url_patterns: 评论接口URL包含的特征字符串
+        """
+        self.url_patterns = url_patterns
+        self._pending: Dict[str, str] = {}    # requestId -> url，已收到响应头
+        self._finished: List[str] = []        # 已加载完成、待读取响应体的 requestId
+
+    @staticmethod
+    def configure_options(options):
+        """开启 performance 日志，driver.get_log('performance') 才能读到网络事件"""
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    def enable(self, driver):
+        """开启 CDP 网络事件"""
+        driver.execute_cdp_cmd('Network.enable', {})
+
+    def matches(self, url: str) -> bool:
+        """URL是否为评论接口"""
+        return any(pattern in url for pattern in self.url_patterns)
+
+    def drain(self, driver) -> List[Dict]:
+        """读取自上次调用以来完成的评论接口响应，返回解析出的评论记录"""
+        for entry in driver.get_log('performance'):
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.responseReceived':
+                url = params.get('response', {}).get('url', '')
+                if self.matches(url):
+                    self._pending[params['requestId']] = url
+            elif method == 'Network.loadingFinished' and params.get('requestId') in self._pending:
+                self._finished.append(params['requestId'])
+
+        reviews = []
+        for request_id in self._finished:
+            url = self._pending.pop(request_id, '')
+            try:
+                response = driver.execute_cdp_cmd('Network.getResponseBody',
+                                                  {'requestId': request_id})
+            except Exception as e:
+                print(f"读取评论接口响应失败 ({url}): {str(e)}")
+                continue
+            body = response.get('body', '')
+            if response.get('base64Encoded'):
+                body = base64.b64decode(body).decode('utf-8', errors='replace')
+            reviews.extend(parse_payload(body))
+        self._finished = []
+        return reviews
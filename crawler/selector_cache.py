@@ -0,0 +1,80 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urlparse
+
+
+class SelectorCache:
+    """
+    选择器命中缓存
+
+    按页面布局（域名）记录每类元素实际命中的CSS选择器及次数，
+    下次按命中次数从高到低优先尝试。命中只在内存中计数，
+    爬虫关闭时（close）统一写入JSON文件。
+    """
+
+    _instances: Dict[str, 'SelectorCache'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.data = self._load()
+
+    @classmethod
+    def shared(cls, path: Path) -> 'SelectorCache':
+        """同一缓存文件在进程内共享一个实例（浏览器池的多个驱动共用）"""
+        key = str(Path(path).resolve())
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(path)
+            return cls._instances[key]
+
+    def _load(self) -> Dict:
+        """读取缓存文件，不存在或损坏时返回空缓存"""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"读取选择器缓存出错: {str(e)}")
+            return {}
+
+    @staticmethod
+    def layout_key(url: str) -> str:
+        """页面布局标识，使用URL的域名（如 item.taobao.com、detail.tmall.com）"""
+        return urlparse(url).netloc or 'unknown'
+
+    def order(self, kind: str, layout: str, selectors: List[str]) -> List[str]:
+        """按命中次数从高到低排列选择器，未命中过的保持原有顺序"""
+        hits = self.data.get(kind, {}).get(layout, {})
+        return sorted(selectors, key=lambda selector: -hits.get(selector, 0))
+
+    def record(self, kind: str, layout: str, selector: str):
+        """记录一次命中（只更新内存，由 save 写入文件）"""
+        with self._lock:
+            layout_hits = self.data.setdefault(kind, {}).setdefault(layout, {})
+            layout_hits[selector] = layout_hits.get(selector, 0) + 1
+            self._dirty = True
+
+    def save(self):
+        """有新的命中时写入缓存文件（先写临时文件再替换，避免中断时损坏）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix('.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.data, f, ensure_ascii=False, indent=2)
+                tmp_path.replace(self.path)
+                self._dirty = False
+            except Exception as e:
+                print(f"保存选择器缓存出错: {str(e)}")
+
+    def close(self):
+        """保存未写入的命中记录"""
+        self.save()
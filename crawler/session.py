@@ -0,0 +1,70 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+
+class SessionStore:
+    """
+    登录状态（Cookie）的持久化
+
+    登录成功后保存驱动的Cookie，下次运行时导入即可恢复登录，
+    无需重新扫码。Cookie 文件等同于登录凭证，仅当前用户可读写。
+    """
+
+    def __init__(self, cookie_path: Path):
+        """
+        Args:
+            cookie_path: Cookie 文件路径
+        """
+        self.cookie_path = Path(cookie_path)
+
+    def load(self) -> List[Dict]:
+        """读取保存的Cookie（去掉已过期的），不存在或损坏时返回空列表"""
+        if not self.cookie_path.exists():
+            return []
+        try:
+            with open(self.cookie_path, 'r', encoding='utf-8') as f:
+                return self.unexpired(json.load(f))
+        except Exception as e:
+            print(f"读取登录状态出错: {str(e)}")
+            return []
+
+    def save(self, cookies: List[Dict]):
+        """保存Cookie（去掉已过期的；先写临时文件再替换，避免中断时损坏）"""
+        cookies = self.unexpired(cookies)
+        try:
+            self.cookie_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cookie_path.with_suffix('.tmp')
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(cookies, f, ensure_ascii=False, indent=2)
+            tmp_path.replace(self.cookie_path)
+        except Exception as e:
+            print(f"保存登录状态出错: {str(e)}")
+
+    def clear(self):
+        """删除保存的Cookie（如登录状态已失效）"""
+        if self.cookie_path.exists():
+            self.cookie_path.unlink()
+
+    @staticmethod
+    def unexpired(cookies: Iterable[Dict]) -> List[Dict]:
+        """去掉 expiry 已过的Cookie（会话Cookie没有 expiry，保留）"""
+        now = time.time()
+        return [cookie for cookie in cookies
+                if cookie.get('expiry') is None or cookie['expiry'] > now]
+
+    @staticmethod
+    def has_login_marker(cookies: Iterable[Dict], markers: Iterable[str]) -> bool:
+        """
+        Cookie 中是否含有全部登录标记
+
+        标记应为登录会话Cookie（如 unb）；_nk_、tracknick 等昵称Cookie
+        退出登录后仍长期保留，不能作为已登录的依据。已过期的Cookie不计入。
+        """
+        names = {cookie.get('name') for cookie in SessionStore.unexpired(cookies)
+                 if cookie.get('value')}
+        markers = list(markers)
+        return bool(markers) and all(marker in names for marker in markers)
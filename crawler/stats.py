@@ -0,0 +1,74 @@
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class CrawlStats:
+    """
+    爬虫性能统计
+
+    统计 WebDriver 往返次数（包装 driver.execute，每个命令一次HTTP往返）、
+    爬取页数和评论数，以及 random_sleep/请求间隔限制和自适应等待轮询
+    所花的时间，用于区分等待时间和有效工作时间。
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """清零统计（如开始爬取新商品前）"""
+        self.started = time.time()
+        self.round_trips = 0
+        self.pages = 0
+        self.reviews = 0
+        self.sleep_time = 0.0
+        self.poll_time = 0.0
+
+    def instrument(self, driver):
+        """包装驱动的 execute 方法，统计 WebDriver 往返次数"""
+        execute = driver.execute
+
+        def counted_execute(*args, **kwargs):
+            self.round_trips += 1
+            return execute(*args, **kwargs)
+
+        driver.execute = counted_execute
+        return driver
+
+    @contextmanager
+    def timed(self, field: str):
+        """把代码块的耗时累加到指定字段（sleep_time 或 poll_time）"""
+        start = time.time()
+        try:
+            yield
+        finally:
+            setattr(self, field, getattr(self, field) + time.time() - start)
+
+    def add_page(self, num_reviews: int):
+        """记录爬完一页"""
+        self.pages += 1
+        self.reviews += num_reviews
+
+    def summary(self) -> Dict:
+        """统计汇总"""
+        elapsed = time.time() - self.started
+        work_time = max(0.0, elapsed - self.sleep_time - self.poll_time)
+        return {
+            'elapsed': round(elapsed, 3),
+            'pages': self.pages,
+            'reviews': self.reviews,
+            'pages_per_second': round(self.pages / elapsed, 3) if elapsed else 0.0,
+            'round_trips': self.round_trips,
+            'round_trips_per_page': round(self.round_trips / self.pages, 1) if self.pages else 0.0,
+            'sleep_time': round(self.sleep_time, 3),
+            'poll_time': round(self.poll_time, 3),
+            'work_time': round(work_time, 3),
+        }
+
+    def report(self) -> str:
+        """可读的统计报告"""
+        s = self.summary()
+        return (f"耗时 {s['elapsed']}s，{s['pages']} 页 / {s['reviews']} 条评论，"
+                f"{s['pages_per_second']} 页/秒，每页 {s['round_trips_per_page']} 次往返；"
+                f"随机等待 {s['sleep_time']}s，轮询等待 {s['poll_time']}s，"
+                f"有效工作 {s['work_time']}s")
@@ -5,12 +5,110 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.chrome.options import Options
 from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlparse
 import time
 import random
 from utils import config
+from .checkpoint import CrawlCheckpoint
+from .dedup import ReviewDeduplicator
+from .network_capture import NetworkCapture
+from .selector_cache import SelectorCache
+from .session import SessionStore
+from .stats import CrawlStats
+
+# 一次 execute_script 提取当前页全部评论的结构化字段，避免逐个元素读取 .text
+# arguments[0]: 评论正文的CSS选择器
+EXTRACT_REVIEWS_JS = """
+const nodes = Array.from(document.querySelectorAll(arguments[0]));
+// 选择器可能同时命中外层和内层元素，只保留最内层
+const leaves = nodes.filter(node => !nodes.some(other => other !== node && node.contains(other)));
+const firstText = (root, selector) => {
+    const el = root.querySelector(selector);
+    return el ? el.innerText.trim() : '';
+};
+return leaves.map(node => {
+    const item = node.closest(
+        "[class*='Comment--'], .rate-item, .tb-rev-item, .J_KgRate_ReviewItem, " +
+        "[class*='review-item'], [class*='comment-item']"
+    ) || node.parentElement || node;
+    const text = node.innerText.trim();
+    const stars = item.querySelectorAll(
+        "[class*='starActive'], [class*='star-active'], [class*='starLight'], .rate-stars .on"
+    ).length;
+    return {
+        id: item.getAttribute('data-id') || item.getAttribute('data-rate-id') || '',
+        text: text,
+        rating: stars || null,
+        date: firstText(item, "[class*='date'], [class*='Date'], [class*='time--'], .tm-rate-date"),
+        sku: firstText(item, "[class*='sku'], [class*='Sku'], .tm-rate-sku, .rate-sku"),
+        is_followup: Boolean(node.closest(
+            "[class*='append'], [class*='Append'], [class*='additional'], .tm-rate-append"
+        )) || /^(追评|追加评论)/.test(text)
+    };
+}).filter(review => review.text);
+"""
+
+# 按顺序检查一组选择器，返回第一个在页面上有匹配元素的选择器
+# （不合法的选择器如 :contains 会被跳过）
+FIND_FIRST_SELECTOR_JS = """
+for (const selector of arguments[0]) {
+    try {
+        if (document.querySelector(selector)) return selector;
+    } catch (e) {}
+}
+return null;
+"""
+
+# 评论节点的签名（数量+首尾文本），用于判断翻页后是否出现了新评论
+REVIEW_SIGNATURE_JS = """
+let nodes = [];
+try { nodes = document.querySelectorAll(arguments[0]); } catch (e) {}
+if (!nodes.length) return '0';
+return nodes.length + '|' + nodes[0].innerText.slice(0, 50) + '|' 
+    + nodes[nodes.length - 1].innerText.slice(0, 50);
+"""
 
 class TaobaoCommentCrawler:
-    def __init__(self):
+    # 评论正文选择器
+    COMMENT_SELECTORS = [
+        "div.Comment--KkPcz74T div.content--FpIOzHeP",
+        "div.contentWrapper--uAdAlCgC div.content--FpIOzHeP",
+        "div.Comment--KkPcz74T div[class*='content']",
+        "div[class*='comment'] div[class*='content']",
+        # 添加更多可能的选择器
+        "div.rate-content",
+        "div.tb-rev-item div.J_KgRate_ReviewContent",
+        "div.review-details"
+    ]
+    
+    # "全部评价"按钮选择器
+    SHOW_ALL_SELECTORS = [
+        "div.ShowButton--o4XEG7ih",
+        "div.footer--h5lcc85O div[class*='ShowButton']",
+        "a[href*='rate']",
+        "div[data-index='1']",
+        "div.tabTitleItem--z4AoobEz",
+        # 添加更多可能的选择器
+        "a.tb-tab-anchor[href*='rate']",
+        "li.J_TabBarItem"
+    ]
+    
+    # 下一页/显示更多按钮选择器
+    NEXT_PAGE_SELECTORS = [
+        "div.ShowButton--o4XEG7ih",
+        "div.footer--h5lcc85O div[class*='ShowButton']",
+        "div[class*='pagination'] button:last-child",
+        "button:contains('下一页')",
+        "div:contains('下一页')"
+    ]
+    
+    def __init__(self, persistent_profile=True):
+        """
+        Args:
+            persistent_profile: 是否使用持久化的浏览器用户目录（SESSION.USER_DATA_DIR）。
+                同一用户目录不能被多个Chrome同时使用，浏览器池中的其他驱动应传入False
+        """
         # 从配置获取爬虫参数
         crawler_config = config.get('CRAWLER')
         self.max_pages = crawler_config.get('MAX_PAGES', 50)
@@ -18,9 +116,60 @@ class TaobaoCommentCrawler:
         self.login_timeout = crawler_config.get('LOGIN_TIMEOUT', 15)
         self.wait_time = crawler_config.get('WAIT_TIME', {'MIN': 2, 'MAX': 5})
         self.user_agent = crawler_config.get('USER_AGENT')
+        self.min_request_interval = crawler_config.get('MIN_REQUEST_INTERVAL', 0)
+        
+        # 自适应等待：轮询直到目标元素出现，最多等待 TIMEOUT 秒
+        adaptive_wait = crawler_config.get('ADAPTIVE_WAIT', {})
+        self.wait_timeout = adaptive_wait.get('TIMEOUT', 10)
+        self.poll_interval = adaptive_wait.get('POLL_INTERVAL', 0.2)
+        self.selector_cache = SelectorCache.shared(
+            Path(config.get('OUTPUT.BASE_DIR', 'output')) / 'cache' 
+            / crawler_config.get('SELECTOR_CACHE_FILE', 'selector_cache.json')
+        )
+        
+        # 网络响应截获模式：直接解析页面评论接口返回的JSON，DOM抓取作为后备
+        capture_config = crawler_config.get('CAPTURE', {})
+        self.network_capture = None
+        if capture_config.get('ENABLED', False):
+            self.network_capture = NetworkCapture(capture_config.get('URL_PATTERNS', []))
+        
+        # 爬取进度：每页评论追加写入 JSONL，中断后可恢复
+        checkpoint_config = crawler_config.get('CHECKPOINT', {})
+        self.checkpoint_enabled = checkpoint_config.get('ENABLED', True)
+        self.checkpoint_dir = (
+            Path(config.get('OUTPUT.BASE_DIR', 'output')) 
+            / checkpoint_config.get('DIR', 'crawl_state')
+        )
+        
+        # 精简浏览器配置：无头模式、屏蔽图片/视频/字体等与评论文本无关的资源
+        self.lean_profile = crawler_config.get('LEAN_PROFILE', {})
         
-        self.driver = self._init_driver()
+        # 登录状态持久化：Cookie 文件和浏览器用户目录
+        session_config = crawler_config.get('SESSION', {})
+        session_dir = Path(config.get('OUTPUT.BASE_DIR', 'output')) / session_config.get('DIR', 'session')
+        self.session_store = SessionStore(session_dir / session_config.get('COOKIE_FILE', 'cookies.json'))
+        self.login_markers = session_config.get('LOGIN_MARKERS', ['unb'])
+        self.login_check_interval = session_config.get('CHECK_INTERVAL', 1)
+        self.user_data_dir = None
+        if persistent_profile and session_config.get('USER_DATA_DIR'):
+            self.user_data_dir = (session_dir / session_config['USER_DATA_DIR']).resolve()
+        
+        # 评论去重：翻页重叠、默认评价和（可选）历史运行已爬取的评论
+        self.dedup_config = crawler_config.get('DEDUP', {})
+        self.dedup = None
+        
+        # 回放模式：所有页面请求改为访问本地桩服务器（tools/stub_server.py）
+        replay_config = crawler_config.get('REPLAY', {})
+        self.replay_base = None
+        if replay_config.get('ENABLED', False):
+            self.replay_base = urlparse(replay_config.get('BASE_URL', 'http://127.0.0.1:8765'))
+        
+        self.stats = CrawlStats()
+        self.driver = self.stats.instrument(self._init_driver())
         self.comments = []
+        self.reviews = []
+        self._last_request_time = 0.0
+        self._comment_selector = None
         
     def _init_driver(self):
         """初始化Chrome驱动"""
@@ -30,21 +179,133 @@ class TaobaoCommentCrawler:
         options.add_argument('--disable-blink-features=AutomationControlled')
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
+        if self.network_capture:
+            NetworkCapture.configure_options(options)
+        if self.lean_profile.get('ENABLED', False):
+            self._apply_lean_options(options)
+        if self.user_data_dir:
+            self.user_data_dir.mkdir(parents=True, exist_ok=True)
+            options.add_argument(f'--user-data-dir={self.user_data_dir}')
         
         driver = webdriver.Chrome(options=options)
         driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
             'source': 'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'
         })
+        if self.network_capture:
+            self.network_capture.enable(driver)
+        if self.lean_profile.get('ENABLED', False):
+            self._block_resources(driver)
         return driver
     
+    def _apply_lean_options(self, options):
+        """精简配置的启动参数：无头模式、禁用GPU、较小窗口、不加载图片"""
+        if self.lean_profile.get('HEADLESS', True):
+            options.add_argument('--headless=new')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--mute-audio')
+        options.add_argument(f"--window-size={self.lean_profile.get('WINDOW_SIZE', '1280,800')}")
+        if self.lean_profile.get('BLOCK_IMAGES', True):
+            options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2
+            })
+    
+    def _block_resources(self, driver):
+        """通过CDP屏蔽视频、字体等资源的请求（图片已由启动参数禁止加载）"""
+        blocked_urls = self.lean_profile.get('BLOCKED_URLS', [])
+        if not blocked_urls:
+            return
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_urls})
+        except Exception as e:
+            print(f"设置资源屏蔽失败: {str(e)}")
+    
     def random_sleep(self):
         """随机等待"""
-        time.sleep(random.uniform(self.wait_time['MIN'], self.wait_time['MAX']))
+        with self.stats.timed('sleep_time'):
+            time.sleep(random.uniform(self.wait_time['MIN'], self.wait_time['MAX']))
+    
+    def _replay_url(self, url):
+        """回放模式下把URL的协议和域名替换为桩服务器地址，路径和参数不变"""
+        if self.replay_base is None:
+            return url
+        return urlparse(url)._replace(scheme=self.replay_base.scheme, 
+                                      netloc=self.replay_base.netloc).geturl()
+    
+    def _wait_request_interval(self):
+        """
+        保证本驱动两次页面请求之间至少间隔 MIN_REQUEST_INTERVAL 秒
+        
+        打开页面、刷新和会加载评论的点击（全部评价、翻页）前都要调用。
+        """
+        elapsed = time.time() - self._last_request_time
+        if elapsed < self.min_request_interval:
+            with self.stats.timed('sleep_time'):
+                time.sleep(self.min_request_interval - elapsed)
+        self._last_request_time = time.time()
+    
+    def _open(self, url):
+        """打开页面，与上一次页面请求的间隔受 MIN_REQUEST_INTERVAL 限制"""
+        self._wait_request_interval()
+        self.driver.get(self._replay_url(url))
+    
+    def load_cookies(self, cookies):
+        """导入Cookie（如其他驱动的登录状态）"""
+        if self.replay_base is not None:
+            return
+        self._open("https://www.taobao.com/")
+        self._add_cookies(cookies)
+    
+    def _add_cookies(self, cookies):
+        """在当前已打开的淘宝页面上添加Cookie并刷新使其生效"""
+        for cookie in cookies:
+            cookie = {key: value for key, value in cookie.items()
+                      if key in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'expiry')}
+            try:
+                self.driver.add_cookie(cookie)
+            except Exception as e:
+                print(f"导入Cookie失败 ({cookie.get('name')}): {str(e)}")
+        self._wait_request_interval()
+        self.driver.refresh()
     
     def _scroll_to_element(self, element):
-        """滚动到元素位置"""
+        """滚动到元素位置（scrollIntoView 是同步的，无需额外等待）"""
         self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-        self.random_sleep()
+    
+    def _layout(self):
+        """当前页面的布局标识"""
+        return SelectorCache.layout_key(self.driver.current_url)
+    
+    def _wait_for_any(self, selectors, timeout=None):
+        """
+        轮询等待任一选择器命中，返回命中的选择器，超时返回None
+        
+        每次轮询用一次 execute_script 检查全部选择器，某个选择器未命中
+        不再单独消耗一次完整的超时。
+        """
+        deadline = time.time() + (self.wait_timeout if timeout is None else timeout)
+        while True:
+            selector = self.driver.execute_script(FIND_FIRST_SELECTOR_JS, selectors)
+            if selector or time.time() >= deadline:
+                return selector
+            with self.stats.timed('poll_time'):
+                time.sleep(self.poll_interval)
+    
+    def _review_signature(self):
+        """当前页面评论节点的签名"""
+        selector = self._comment_selector or self.COMMENT_SELECTORS[0]
+        return self.driver.execute_script(REVIEW_SIGNATURE_JS, selector)
+    
+    def _wait_for_new_reviews(self, old_signature, timeout=None):
+        """等待评论节点发生变化（翻页或加载更多），超时返回False"""
+        deadline = time.time() + (self.wait_timeout if timeout is None else timeout)
+        while time.time() < deadline:
+            if self._review_signature() != old_signature:
+                return True
+            with self.stats.timed('poll_time'):
+                time.sleep(self.poll_interval)
+        return False
     
     def _click_element(self, element):
         """使用JavaScript点击元素"""
@@ -65,8 +326,15 @@ class TaobaoCommentCrawler:
         except TimeoutException:
             return None
     
-    def _find_and_click(self, selectors, text_conditions=None):
-        """查找并点击符合条件的元素"""
+    def _find_and_click(self, selectors, text_conditions=None, kind=None):
+        """
+        查找并点击符合条件的元素
+        
+        指定 kind 时按选择器缓存的命中次数排序，并记录本次点击成功的选择器。
+        """
+        if kind:
+            layout = self._layout()
+            selectors = self.selector_cache.order(kind, layout, selectors)
         for selector in selectors:
             try:
                 elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
@@ -74,6 +342,8 @@ class TaobaoCommentCrawler:
                     if text_conditions is None or any(cond in element.text for cond in text_conditions):
                         self._scroll_to_element(element)
                         if self._click_element(element) or self._try_normal_click(element):
+                            if kind:
+                                self.selector_cache.record(kind, layout, selector)
                             return True
             except Exception as e:
                 print(f"点击元素时出错: {str(e)}")
@@ -90,79 +360,217 @@ class TaobaoCommentCrawler:
             return False
     
     def _get_comments_from_page(self):
-        """从当前页面获取评论"""
-        comment_selectors = [
-            "div.Comment--KkPcz74T div.content--FpIOzHeP",
-            "div.contentWrapper--uAdAlCgC div.content--FpIOzHeP",
-            "div.Comment--KkPcz74T div[class*='content']",
-            "div[class*='comment'] div[class*='content']",
-            # 添加更多可能的选择器
-            "div.rate-content",
-            "div.tb-rev-item div.J_KgRate_ReviewContent",
-            "div.review-details"
-        ]
-        
-        for selector in comment_selectors:
+        """从当前页面获取评论正文"""
+        return [review['text'] for review in self._get_reviews_from_page()]
+    
+    def _get_page_reviews(self):
+        """获取当前页评论：优先使用截获的接口响应，没有时从DOM提取"""
+        if self.network_capture:
             try:
-                # 等待评论加载
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                comments = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if comments:
-                    return [comment.text.strip() for comment in comments if comment.text.strip()]
-            except TimeoutException:
-                continue
+                reviews = self.network_capture.drain(self.driver)
+                if reviews:
+                    return reviews
+            except Exception as e:
+                print(f"读取截获的评论接口响应出错，改用DOM提取: {str(e)}")
+        return self._get_reviews_from_page()
+    
+    def _get_reviews_from_page(self):
+        """
+        从当前页面获取结构化评论
+        
+        等待评论出现后用一次 execute_script 取回全部字段，每页只需一次
+        WebDriver 往返，而不是每条评论两次 .text 请求。
+        
+        Returns:
+            评论字典列表，包含 id、text、rating、date、sku、is_followup
+        """
+        layout = self._layout()
+        selectors = self.selector_cache.order('comments', layout, self.COMMENT_SELECTORS)
+        
+        # 等待任一选择器出现，优先尝试该选择器，再依次尝试其余选择器（不再等待）
+        matched = self._wait_for_any(selectors)
+        if matched is None:
+            return []
+        candidates = [matched] + [selector for selector in selectors if selector != matched]
+        
+        for selector in candidates:
+            try:
+                reviews = self.driver.execute_script(EXTRACT_REVIEWS_JS, selector)
+                if reviews:
+                    self._comment_selector = selector
+                    self.selector_cache.record('comments', layout, selector)
+                    return reviews
             except Exception as e:
                 print(f"获取评论时出错 (选择器: {selector}): {str(e)}")
         return []
     
+    def is_logged_in(self):
+        """当前Cookie中是否有已登录标记"""
+        return SessionStore.has_login_marker(self.driver.get_cookies(), self.login_markers)
+    
+    def save_session(self):
+        """保存当前登录状态"""
+        self.session_store.save(self.driver.get_cookies())
+    
+    def restore_session(self):
+        """
+        导入保存的Cookie，返回是否恢复了登录状态
+        
+        需在已打开淘宝页面时调用，Cookie 直接加到当前页面并刷新，不再重新打开。
+        保存的Cookie没有登录标记或导入后仍未登录时，删除Cookie文件。
+        """
+        cookies = self.session_store.load()
+        if not cookies:
+            return False
+        if SessionStore.has_login_marker(cookies, self.login_markers):
+            self._add_cookies(cookies)
+            if self.is_logged_in():
+                return True
+        print("保存的登录状态已失效")
+        self.session_store.clear()
+        return False
+    
     def login(self):
-        """手动登录淘宝"""
-        self.driver.get("https://login.taobao.com/")
+        """
+        登录淘宝
+        
+        依次尝试浏览器用户目录中的登录状态和保存的Cookie，都无效时打开登录页
+        等待手动登录，检测到登录标记即返回，最多等待 LOGIN_TIMEOUT 秒。
+        登录成功后保存Cookie供下次运行使用。
+        
+        Returns:
+            是否已登录
+        """
+        if self.replay_base is not None:
+            print("回放模式，跳过登录")
+            return True
+        
+        self._open("https://www.taobao.com/")
+        if self.is_logged_in() or self.restore_session():
+            print("已恢复登录状态")
+            self.save_session()
+            return True
+        
+        self._open("https://login.taobao.com/")
         print(f"请在{self.login_timeout}秒内完成手动登录")
-        time.sleep(self.login_timeout)
+        deadline = time.time() + self.login_timeout
+        while time.time() < deadline:
+            if self.is_logged_in():
+                print("登录成功")
+                self.save_session()
+                return True
+            time.sleep(self.login_check_interval)
+        
+        print("未检测到登录状态，将以未登录状态继续")
+        return False
     
-    def get_comments(self, product_url, pages=None):
-        """爬取商品评论"""
+    def get_checkpoint(self, product_url):
+        """获取商品的爬取进度，未启用进度保存时返回None"""
+        if not self.checkpoint_enabled:
+            return None
+        return CrawlCheckpoint(self.checkpoint_dir, product_url)
+    
+    def get_comments(self, product_url, pages=None, resume=False, on_page=None):
+        """
+        爬取商品评论
+        
+        Args:
+            product_url: 商品URL
+            pages: 最大爬取页数，默认使用 CRAWLER.MAX_PAGES
+            resume: 是否从上次中断处继续：恢复已保存的评论并跳过已爬取的页面
+            on_page: 每得到一页（去重后的）评论时调用，参数为该页的评论字典列表，
+                用于边爬取边分析
+        """
         try:
             # 使用配置的最大页数
             if pages is None:
                 pages = self.max_pages
             
+            self.stats.reset()
+            
+            # 恢复或重置爬取进度
+            checkpoint = self.get_checkpoint(product_url)
+            pages_done = 0
+            self.dedup = None
+            if self.dedup_config.get('ENABLED', True):
+                self.dedup = ReviewDeduplicator(
+                    product_url, self.dedup_config,
+                    Path(config.get('OUTPUT.BASE_DIR', 'output')) / 'cache'
+                )
+            if checkpoint is not None:
+                if resume and checkpoint.exists():
+                    pages_done, saved_reviews = checkpoint.load()
+                    self.reviews.extend(saved_reviews)
+                    self.comments.extend(review['text'] for review in saved_reviews)
+                    if self.dedup is not None:
+                        self.dedup.remember(saved_reviews)
+                    if on_page and saved_reviews:
+                        on_page(saved_reviews)
+                    print(f"已恢复 {pages_done} 页、{len(saved_reviews)} 条评论")
+                    if checkpoint.finished or pages_done >= pages:
+                        print("该商品已爬取完成，无需继续")
+                        return
+                else:
+                    checkpoint.reset()
+            
             # 访问商品页面
             print(f"正在访问商品页面: {product_url}")
-            self.driver.get(product_url)
-            self.random_sleep()
+            self._open(product_url)
+            self._wait_for_any(self.SHOW_ALL_SELECTORS + self.COMMENT_SELECTORS)
             
             # 点击全部评价按钮
             if not self._show_all_comments(product_url):
                 print("无法访问评价页面，程序终止")
                 return
             
+            # 跳过已爬取的页面
+            if pages_done and not self._skip_pages(pages_done):
+                if checkpoint is not None:
+                    checkpoint.mark_finished()
+                return
+            
             # 爬取评论
-            page_count = 0
+            page_count = pages_done
             retry_count = 0
+            finished = False
             
             while page_count < pages and retry_count < self.retry_times:
                 # 获取当前页评论
-                new_comments = self._get_comments_from_page()
+                page_reviews = self._get_page_reviews()
                 
-                if new_comments:
-                    self.comments.extend(new_comments)
-                    print(f"已爬取第{page_count + 1}页评论，当前共{len(self.comments)}条评论")
+                if page_reviews:
+                    # 找到评论即算作一页，即使去重后全部是重复评论
+                    new_reviews = page_reviews
+                    if self.dedup is not None:
+                        new_reviews = self.dedup.filter(page_reviews)
+                    self.reviews.extend(new_reviews)
+                    self.comments.extend(review['text'] for review in new_reviews)
                     page_count += 1
                     retry_count = 0
+                    if checkpoint is not None:
+                        checkpoint.append_page(page_count, new_reviews)
+                    if on_page and new_reviews:
+                        on_page(new_reviews)
+                    self.stats.add_page(len(new_reviews))
+                    print(f"已爬取第{page_count}页评论，当前共{len(self.comments)}条评论")
                     
                     # 尝试进入下一页
                     if not self._go_to_next_page():
                         print("已到达最后一页")
+                        finished = True
                         break
                 else:
                     retry_count += 1
                     print(f"第{page_count + 1}页未找到评论，重试第{retry_count}次")
                     self.random_sleep()
             
+            if checkpoint is not None and (finished or page_count >= pages):
+                checkpoint.mark_finished()
+            
+            if self.dedup is not None:
+                print(self.dedup.report())
+            print(self.stats.report())
+            
             if not self.comments:
                 print("警告：未获取到任何评论")
             else:
@@ -170,25 +578,37 @@ class TaobaoCommentCrawler:
             
         except Exception as e:
             print(f"爬取评论出错: {str(e)}")
+        finally:
+            if self.dedup is not None:
+                self.dedup.save()
+    
+    def _skip_pages(self, count):
+        """
+        翻过已爬取的页面，返回是否还有未爬取的页面
+        
+        翻页期间截获的接口响应属于已爬取的页面，直接丢弃。
+        """
+        print(f"正在跳过已爬取的 {count} 页...")
+        for _ in range(count):
+            if not self._go_to_next_page():
+                print("已到达最后一页，没有未爬取的页面")
+                return False
+        if self.network_capture:
+            try:
+                self.network_capture.drain(self.driver)
+            except Exception as e:
+                print(f"丢弃已爬取页面的接口响应出错: {str(e)}")
+        return True
     
     def _show_all_comments(self, product_url):
         """显示所有评论"""
-        # 尝试点击"全部评价"按钮
-        show_all_selectors = [
-            "div.ShowButton--o4XEG7ih",
-            "div.footer--h5lcc85O div[class*='ShowButton']",
-            "a[href*='rate']",
-            "div[data-index='1']",
-            "div.tabTitleItem--z4AoobEz",
-            # 添加更多可能的选择器
-            "a.tb-tab-anchor[href*='rate']",
-            "li.J_TabBarItem"
-        ]
-        
         retry_count = 0
         while retry_count < self.retry_times:
-            if self._find_and_click(show_all_selectors, ['全部评价', '查看全部', '评价']):
-                self.random_sleep()
+            # 尝试点击"全部评价"按钮，评论出现即返回
+            self._wait_request_interval()
+            if self._find_and_click(self.SHOW_ALL_SELECTORS, ['全部评价', '查看全部', '评价'],
+                                    kind='show_all'):
+                self._wait_for_any(self.COMMENT_SELECTORS)
                 return True
                 
             print(f"尝试第 {retry_count + 1} 次切换到评价页面...")
@@ -197,8 +617,8 @@ class TaobaoCommentCrawler:
             try:
                 # 尝试直接访问评价页面
                 rate_url = f"{product_url.split('?')[0]}/rate.htm"
-                self.driver.get(rate_url)
-                self.random_sleep()
+                self._open(rate_url)
+                self._wait_for_any(self.COMMENT_SELECTORS)
                 return True
             except Exception as e:
                 print(f"访问评价页面失败: {str(e)}")
@@ -207,17 +627,18 @@ class TaobaoCommentCrawler:
         return False
     
     def _go_to_next_page(self):
-        """进入下一页"""
-        next_selectors = [
-            "div.ShowButton--o4XEG7ih",
-            "div.footer--h5lcc85O div[class*='ShowButton']",
-            "div[class*='pagination'] button:last-child",
-            "button:contains('下一页')",
-            "div:contains('下一页')"
-        ]
-        
-        if self._find_and_click(next_selectors, ['下一页', '显示更多']):
-            self.random_sleep()
+        """
+        进入下一页，新评论出现即返回
+        
+        翻页点击会请求新一页评论，点击前同样按 MIN_REQUEST_INTERVAL 限速；
+        自适应等待只缩短等待新评论的时间，不影响请求间隔。
+        """
+        old_signature = self._review_signature()
+        self._wait_request_interval()
+        if self._find_and_click(self.NEXT_PAGE_SELECTORS, ['下一页', '显示更多'], 
+                                kind='next_page'):
+            if not self._wait_for_new_reviews(old_signature):
+                print(f"{self.wait_timeout}秒内未出现新评论")
             return True
         
         print("没有更多页面")
@@ -227,6 +648,13 @@ class TaobaoCommentCrawler:
         """获取所有评论"""
         return self.comments
     
+    def get_all_reviews(self):
+        """获取所有结构化评论"""
+        return self.reviews
+    
     def close(self):
-        """关闭浏览器"""
-        self.driver.quit() 
\ No newline at end of file
+        """保存选择器命中缓存并关闭浏览器"""
+        try:
+            self.selector_cache.close()
+        finally:
+            self.driver.quit() 
\ No newline at end of file
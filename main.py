@@ -1,38 +1,36 @@
-from crawler import TaobaoCommentCrawler
-from analysis import TextAnalyzer
-from visualization import WordCloudGenerator
-from typing import Optional
+"""
+程序入口
+
+不带参数时运行交互式完整流程（登录、爬取、分析、可视化）；
+带子命令时运行单个阶段，见 cli 包：
+
+    python main.py crawl <商品URL或URL列表文件>
+    python main.py analyze <评论文件>
+    python main.py topics <评论文件>
+    python main.py render <lda_visualization.json>
+
+爬虫、分析和可视化模块在用到时才导入，启动时只加载标准库和配置。
+"""
+from pathlib import Path
+import json
 import sys
 import traceback
-import pandas as pd
+from cli.common import (ask_resume, product_key, save_comments, save_topics, save_word_freq,
+                        source_key, validate_config)
 from utils.output_manager import OutputManager
 from utils.log_manager import LogManager
 from utils import config
 
-def validate_config():
-    """验证配置是否有效"""
-    required_configs = [
-        'CRAWLER.MAX_PAGES',
-        'CRAWLER.WAIT_TIME',
-        'CRAWLER.LOGIN_TIMEOUT',
-        'VISUALIZATION.WORDCLOUD',
-        'OUTPUT.BASE_DIR',
-        'OUTPUT.KEEP_RUNS',
-        'OUTPUT.SUBDIRS',
-        'OUTPUT.FILE_NAMES'
-    ]
-    
-    missing_configs = []
-    for key in required_configs:
-        if config.get(key) is None:
-            missing_configs.append(key)
-            
-    if missing_configs:
-        raise ValueError(f"缺少必要的配置项: {', '.join(missing_configs)}")
-
 def main() -> None:
-    """主程序入口"""
+    """交互式完整流程"""
+    from crawler import TaobaoCommentCrawler, CrawlerPool
+    from analysis import AnalysisPipeline, TextAnalyzer
+    from visualization import RenderPool, WordCloudGenerator
+    import pandas as pd
+    
     crawler = None
+    pool = None
+    render_pool = None
     
     try:
         # 验证配置
@@ -50,40 +48,91 @@ def main() -> None:
         
         # 初始化组件
         crawler = TaobaoCommentCrawler()
-        analyzer = TextAnalyzer(output_manager)
+        render_pool = RenderPool()
+        analyzer = TextAnalyzer(output_manager, render_pool)
         word_cloud = WordCloudGenerator(output_manager)
         
         # 登录淘宝
         logger.info("开始登录淘宝...")
         crawler.login()
         
-        # 获取商品URL
-        product_url = input("\n请输入淘宝商品URL：").strip()
+        # 获取商品URL（或每行一个URL的列表文件）
+        product_url = input("\n请输入淘宝商品URL或URL列表文件：").strip()
         if not product_url:
             logger.error("URL不能为空")
             return
+        
+        # 保存的LDA模型按商品（URL列表文件按文件）区分，增量训练只复用同一商品的模型
+        url_list = Path(product_url).is_file()
+        analyzer.set_model_key(source_key(product_url) if url_list else product_key(product_url))
+            
+        # 流水线模式：爬取的同时在后台线程分词（流式分析模式下不使用）
+        pipeline = None
+        pipeline_config = config.get('ANALYSIS.PIPELINE', {})
+        if (pipeline_config.get('ENABLED', False) 
+                and not config.get('ANALYSIS.STREAMING.ENABLED', False)):
+            logger.info("使用流水线模式，边爬取边分词")
+            pipeline = AnalysisPipeline(
+                analyzer,
+                queue_size=pipeline_config.get('QUEUE_SIZE', 100),
+                batch_pages=pipeline_config.get('BATCH_PAGES', 10)
+            ).start()
+        on_page = pipeline.on_page if pipeline else None
             
         # 爬取评论
         logger.info("开始爬取评论...")
-        crawler.get_comments(product_url)
+        if url_list:
+            # 多商品：浏览器池并发爬取，复用已登录的驱动
+            product_urls = CrawlerPool.load_urls(product_url)
+            resume = ask_resume(crawler, product_urls)
+            logger.info(f"使用浏览器池爬取 {len(product_urls)} 个商品")
+            pool = CrawlerPool(seed_crawler=crawler)
+            product_comments = pool.crawl(product_urls, resume=resume, on_page=on_page)
+            for url, url_comments in product_comments.items():
+                logger.info(f"{url}: {len(url_comments)} 条评论")
+                
+            product_file = output_manager.get_path(
+                'product_comments.json',
+                subdir=config.get('OUTPUT.SUBDIRS.DATA', 'data')
+            )
+            with open(product_file, 'w', encoding='utf-8') as f:
+                json.dump(product_comments, f, ensure_ascii=False, indent=2)
+            logger.info(f"各商品评论已保存到: {product_file}")
+            comments = [comment for url_comments in product_comments.values() 
+                        for comment in url_comments]
+        else:
+            crawler.get_comments(product_url, resume=ask_resume(crawler, [product_url]), 
+                                 on_page=on_page)
+            comments = crawler.get_all_comments()
         
         # 获取评论数据
-        comments = crawler.get_all_comments()
         if not comments:
             logger.error("未获取到任何评论，程序终止")
             return
         logger.info(f"成功获取 {len(comments)} 条评论")
+        
+        # 保存评论数据（每行一条评论，流式分析直接读取该文件）
+        comments_file = save_comments(output_manager, comments)
+        logger.info(f"评论数据已保存到: {comments_file}")
             
         # 分析评论
         logger.info("开始分析评论...")
-        word_freq = analyzer.analyze_comments(comments)
+        if config.get('ANALYSIS.STREAMING.ENABLED', False):
+            logger.info("使用流式分析模式")
+            corpus = analyzer.build_streamed_corpus(comments_file)
+        elif pipeline:
+            # 爬取期间已完成分词，等待队列中剩余的评论处理完
+            corpus = pipeline.close()
+        else:
+            corpus = analyzer.build_corpus(comments)
+        word_freq = analyzer.analyze_comments(corpus)
         if not word_freq:
             logger.error("词频分析结果为空，程序终止")
             return
             
-        # 生成词云
+        # 生成词云（提交到渲染进程池，与主题分析并行）
         logger.info("正在生成词云...")
-        word_cloud.generate(word_freq)
+        word_cloud.submit(render_pool, word_freq)
         
         # 输出词频统计
         logger.info("生成词频统计...")
@@ -92,7 +141,7 @@ def main() -> None:
         
         # 主题分析
         logger.info("开始主题分析...")
-        topic_df = analyzer.analyze_topics(comments)
+        topic_df = analyzer.analyze_topics(corpus)
         if not topic_df.empty:
             logger.info("\n主题分析结果：")
             # 设置pandas显示选项
@@ -105,35 +154,18 @@ def main() -> None:
             topic_df.to_csv('topic_analysis.csv', index=False, encoding='utf-8-sig')
             logger.info("\n主题分析结果已保存到 topic_analysis.csv")
             
-        # 保存评论数据
-        comments_file = output_manager.get_path(
-            config.get('OUTPUT.FILE_NAMES.COMMENTS', 'comments.txt'),
-            subdir=config.get('OUTPUT.SUBDIRS.DATA', 'data')
-        )
-        with open(comments_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(comments))
-        logger.info(f"\n评论数据已保存到: {comments_file}")
-        
         # 保存词频数据
-        freq_file = output_manager.get_path(
-            config.get('OUTPUT.FILE_NAMES.WORD_FREQ', 'word_frequencies.csv'),
-            subdir=config.get('OUTPUT.SUBDIRS.DATA', 'data')
-        )
-        pd.DataFrame(word_freq.most_common(), 
-                    columns=['词语', '频次']).to_csv(freq_file, 
-                                                 index=False, 
-                                                 encoding='utf-8-sig')
+        freq_file = save_word_freq(output_manager, word_freq)
         logger.info(f"词频统计已保存到: {freq_file}")
         
         # 保存主题分析结果
         if not topic_df.empty:
-            topic_file = output_manager.get_path(
-                config.get('OUTPUT.FILE_NAMES.TOPIC_ANALYSIS', 'topic_analysis.csv'),
-                subdir=config.get('OUTPUT.SUBDIRS.DATA', 'data')
-            )
-            topic_df.to_csv(topic_file, index=False, encoding='utf-8-sig')
+            topic_file = save_topics(output_manager, topic_df)
             logger.info(f"主题分析结果已保存到: {topic_file}")
         
+        # 等待图表渲染完成
+        render_pool.wait()
+        
         # 清理旧的运行目录
         output_manager.clean_old_runs()
         logger.info("程序执行完成")
@@ -143,8 +175,16 @@ def main() -> None:
     except Exception as e:
         logger.error(f"程序执行出错: {str(e)}")
     finally:
-        if crawler:
+        if render_pool:
+            render_pool.close()
+        if pool:
+            pool.close()
+        elif crawler:
             crawler.close()
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # 子命令模式：只导入所运行阶段需要的模块
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
     main() 
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+爬虫离线性能测试
+
+在本地启动桩服务器（tools/stub_server.py），以回放模式运行爬虫，
+输出每秒页数、每页 WebDriver 往返次数，以及随机等待/轮询等待与
+有效工作的耗时对比。不访问淘宝，结果可在无网络的机器上复现。
+
+用法（在项目根目录运行）:
+    python tools/benchmark_crawler.py --pages 20 --latency 0.1
+    python tools/benchmark_crawler.py --pages 20 --capture --json
+"""
+import argparse
+import json
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from stub_server import make_server  # noqa: E402
+from utils import config  # noqa: E402
+
+
+def configure(args, base_url: str):
+    """只在内存中修改配置，不写回 config.json"""
+    overrides = {
+        'CRAWLER.REPLAY.ENABLED': True,
+        'CRAWLER.REPLAY.BASE_URL': base_url,
+        'CRAWLER.WAIT_TIME': {'MIN': args.wait_min, 'MAX': args.wait_max},
+        'CRAWLER.MIN_REQUEST_INTERVAL': args.min_interval,
+        'CRAWLER.CAPTURE.ENABLED': args.capture,
+        'CRAWLER.LEAN_PROFILE.ENABLED': not args.headed,
+        'CRAWLER.SESSION.USER_DATA_DIR': '',
+        'CRAWLER.CHECKPOINT.ENABLED': False,
+        'CRAWLER.DEDUP.CROSS_RUN.ENABLED': False,
+    }
+    for key, value in overrides.items():
+        config.set(key, value, save=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='爬虫离线性能测试')
+    parser.add_argument('--port', type=int, default=8765, help='桩服务器端口')
+    parser.add_argument('--pages', type=int, default=20, help='评论总页数')
+    parser.add_argument('--page-size', type=int, default=20, help='每页评论条数')
+    parser.add_argument('--latency', type=float, default=0.0, help='每个请求的延迟（秒）')
+    parser.add_argument('--wait-min', type=float, default=0.0, help='WAIT_TIME.MIN')
+    parser.add_argument('--wait-max', type=float, default=0.0, help='WAIT_TIME.MAX')
+    parser.add_argument('--min-interval', type=float, default=0.0, help='MIN_REQUEST_INTERVAL')
+    parser.add_argument('--capture', action='store_true', help='使用网络响应截获模式')
+    parser.add_argument('--headed', action='store_true', help='使用有界面的浏览器')
+    parser.add_argument('--json', action='store_true', help='以JSON格式输出结果')
+    args = parser.parse_args()
+
+    server = make_server(args.port, latency=args.latency, pages=args.pages,
+                         page_size=args.page_size, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{args.port}"
+    configure(args, base_url)
+
+    # 配置修改后再导入爬虫，避免模块级读取到旧配置
+    from crawler import TaobaoCommentCrawler
+
+    crawler = TaobaoCommentCrawler(persistent_profile=False)
+    try:
+        crawler.get_comments(f"{base_url}/item.htm?id=1", pages=args.pages)
+        summary = crawler.stats.summary()
+    finally:
+        crawler.close()
+        server.shutdown()
+        server.server_close()
+
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        print(crawler.stats.report())
+
+
+if __name__ == '__main__':
+    main()
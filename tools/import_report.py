@@ -0,0 +1,141 @@
+"""
+启动导入耗时报告
+
+对每个子命令在新的解释器中运行 `python -X importtime -c "import cli; cli.load('<子命令>')"`，
+即导入子命令模块及其运行时会导入的模块（RUNTIME_MODULES），汇总该子命令实际加载的模块总耗时，
+并按顶层包（gensim、jieba 等）统计耗时，用于发现启动变慢（例如某个子命令意外开始加载
+gensim 或 matplotlib）。
+
+目标:
+    startup  python main.py 本身（解析参数前）的导入
+    crawl / analyze / topics / render / batch  对应子命令的导入
+    full     交互式完整流程的导入
+
+用法（在项目根目录运行）:
+    python tools/import_report.py
+    python tools/import_report.py render topics --top 10
+    python tools/import_report.py --budget render=300 --json
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 目标 -> 导入语句
+TARGETS = {
+    'startup': 'import main',
+    'crawl': "import cli; cli.load('crawl')",
+    'analyze': "import cli; cli.load('analyze')",
+    'topics': "import cli; cli.load('topics')",
+    'render': "import cli; cli.load('render')",
+    'batch': "import cli; cli.load('batch')",
+    'full': ("import main, cli, analysis.pipeline, visualization.render_pool; "
+             "[cli.load(command) for command in ('crawl', 'analyze', 'topics')]"),
+}
+
+# -X importtime 的输出行：import time: <self us> | <cumulative us> | <缩进><模块名>
+_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)')
+
+
+def _importtime(statement: str) -> List[Tuple[int, str, int, int]]:
+    """在新的解释器中执行语句，返回 (缩进, 模块名, 自身耗时us, 累计耗时us) 列表"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((len(indent), name, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def measure(statement: str, baseline: Set[str]) -> Dict:
+    """
+    测量导入语句的耗时
+
+    Args:
+        statement: 导入语句
+        baseline: 解释器启动时已导入的模块，不计入
+
+    Returns:
+        total_ms: 全部导入耗时；modules: 导入的模块数；
+        packages: 各顶层包的导入耗时（包内模块自身耗时之和），按耗时降序
+    """
+    entries = [entry for entry in _importtime(statement) if entry[1] not in baseline]
+    packages = defaultdict(int)
+    for _, name, self_us, _ in entries:
+        packages[name.split('.')[0]] += self_us
+    return {
+        'total_ms': round(sum(packages.values()) / 1000, 1),
+        'modules': len(entries),
+        'packages': [(name, round(us / 1000, 1))
+                     for name, us in sorted(packages.items(), key=lambda x: -x[1])],
+    }
+
+
+def parse_budgets(values: List[str]) -> Dict[str, float]:
+    """解析 --budget 目标=毫秒"""
+    budgets = {}
+    for value in values:
+        target, _, ms = value.partition('=')
+        if target not in TARGETS or not ms:
+            raise ValueError(f"无效的预算: {value}")
+        budgets[target] = float(ms)
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description='子命令启动导入耗时报告')
+    parser.add_argument('targets', nargs='*',
+                        help=f"要测量的目标（{'、'.join(TARGETS)}），默认全部")
+    parser.add_argument('--top', type=int, default=5, help='显示耗时最多的顶层包个数')
+    parser.add_argument('--repeat', type=int, default=3, help='每个目标测量次数，取最小值')
+    parser.add_argument('--budget', action='append', default=[],
+                        help='耗时上限，如 render=300（毫秒），超出时退出码为1')
+    parser.add_argument('--json', action='store_true', help='以JSON格式输出结果')
+    args = parser.parse_args()
+
+    unknown = [target for target in args.targets if target not in TARGETS]
+    if unknown:
+        parser.error(f"未知的目标: {', '.join(unknown)}")
+    budgets = parse_budgets(args.budget)
+    targets = args.targets or list(TARGETS)
+
+    baseline = {name for _, name, _, _ in _importtime('pass')}
+    report = {}
+    for target in targets:
+        runs = [measure(TARGETS[target], baseline) for _ in range(max(1, args.repeat))]
+        best = min(runs, key=lambda run: run['total_ms'])
+        best['packages'] = best['packages'][:args.top]
+        report[target] = best
+
+    over_budget = [target for target, ms in budgets.items()
+                   if target in report and report[target]['total_ms'] > ms]
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        for target, result in report.items():
+            print(f"{target:<8} {result['total_ms']:>8.1f} ms  {result['modules']:>5} 个模块")
+            for name, ms in result['packages']:
+                print(f"    {ms:>8.1f} ms  {name}")
+    for target in over_budget:
+        print(f"{target} 导入耗时 {report[target]['total_ms']} ms 超出预算 {budgets[target]} ms",
+              file=sys.stderr)
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
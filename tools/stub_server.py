@@ -0,0 +1,162 @@
+"""
+离线测试用的评论页桩服务器
+
+模拟商品页和 mtop 评论接口，用于在不访问淘宝的情况下测试爬虫的
+网络响应截获模式、DOM提取回退和爬取性能（见 tools/benchmark_crawler.py）。
+
+评论接口优先返回 fixtures 目录中录制的 rate_page_N.json；指定 --pages 时，
+超出录制数据的页码按 --page-size 生成评论，并由 --pages 决定是否还有下一页。
+--latency 为每个请求增加固定延迟，模拟网络耗时。
+
+用法:
+    python tools/stub_server.py --port 8765 --pages 20 --latency 0.2
+    然后在配置中开启 CRAWLER.REPLAY，或以 http://127.0.0.1:8765/item.htm 作为商品URL
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+RATE_API_PATH = '/h5/mtop.taobao.rate.detaillist.get/6.0/'
+
+# 生成评论时使用的短语
+_PHRASES = (
+    '质量很好', '面料舒服', '尺码偏小', '物流很快', '包装完好', '颜色和图片一样',
+    '性价比高', '做工一般', '客服态度好', '穿着很合身', '有点起球', '会回购'
+)
+
+
+def generate_rate_page(page: int, page_size: int) -> Dict:
+    """按页码生成确定的评论数据（与录制数据格式相同）"""
+    rate_list = []
+    for i in range(page_size):
+        n = (page - 1) * page_size + i
+        phrases = [_PHRASES[(n * 7 + k * 3) % len(_PHRASES)] for k in range(3)]
+        rate_list.append({
+            'id': str(1300000000000 + n),
+            'feedback': f"{'，'.join(phrases)}，第{n}条评论。",
+            'feedbackDate': f"2024-06-{n % 28 + 1:02d}",
+            'skuValueStr': f"颜色分类:{('黑色', '白色', '灰色')[n % 3]};尺码:{('M', 'L', 'XL')[n % 3]}",
+            'rateStar': str(5 - n % 3)
+        })
+    return {
+        'api': 'mtop.taobao.rate.detaillist.get',
+        'ret': ['SUCCESS::调用成功'],
+        'data': {'rateList': rate_list, 'hasNext': 'false'}
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """商品页和评论接口的请求处理"""
+
+    fixtures_dir = FIXTURES_DIR
+    latency = 0.0
+    pages: Optional[int] = None
+    page_size = 20
+    quiet = False
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        parsed = urlparse(self.path)
+        if parsed.path == RATE_API_PATH:
+            self._send_rate_page(parse_qs(parsed.query))
+        elif parsed.path == '/favicon.ico':
+            self.send_error(404)
+        else:
+            # 商品页、评价页（rate.htm）等其他页面都返回同一个商品页
+            self._send_file(self.fixtures_dir / 'product.html', 'text/html; charset=utf-8')
+
+    def _send_file(self, path: Path, content_type: str):
+        try:
+            body = path.read_bytes()
+        except OSError:
+            self.send_error(404)
+            return
+        self._send(body, content_type)
+
+    def _load_rate_page(self, page: int) -> Dict:
+        """读取录制的评论页，没有时按 --pages 生成或返回空页"""
+        page_path = self.fixtures_dir / f'rate_page_{page}.json'
+        if page_path.exists():
+            payload = json.loads(page_path.read_text(encoding='utf-8'))
+        elif self.pages is not None and page <= self.pages:
+            payload = generate_rate_page(page, self.page_size)
+        else:
+            payload = generate_rate_page(page, 0)
+
+        if self.pages is not None:
+            payload['data']['hasNext'] = 'true' if page < self.pages else 'false'
+        return payload
+
+    def _send_rate_page(self, query):
+        """按页码返回评论数据，带 callback 参数时包装为JSONP"""
+        try:
+            page = int(query.get('page', ['1'])[0])
+        except ValueError:
+            page = 1
+        payload = json.dumps(self._load_rate_page(page), ensure_ascii=False)
+
+        callback = query.get('callback', [''])[0]
+        if callback:
+            self._send(f'{callback}({payload})'.encode('utf-8'),
+                       'application/javascript; charset=utf-8')
+        else:
+            self._send(payload.encode('utf-8'), 'application/json; charset=utf-8')
+
+    def _send(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            print(f"[stub] {self.address_string()} {format % args}")
+
+
+def make_server(port: int = 8765,
+                fixtures: Path = FIXTURES_DIR,
+                latency: float = 0.0,
+                pages: Optional[int] = None,
+                page_size: int = 20,
+                quiet: bool = False) -> ThreadingHTTPServer:
+    """创建桩服务器（每个服务器使用独立的处理类，参数互不影响）"""
+    handler = type('ConfiguredStubHandler', (StubHandler,), {
+        'fixtures_dir': Path(fixtures),
+        'latency': latency,
+        'pages': pages,
+        'page_size': page_size,
+        'quiet': quiet,
+    })
+    return ThreadingHTTPServer(('127.0.0.1', port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='离线评论页桩服务器')
+    parser.add_argument('--port', type=int, default=8765, help='监听端口')
+    parser.add_argument('--fixtures', type=Path, default=FIXTURES_DIR, help='录制数据目录')
+    parser.add_argument('--latency', type=float, default=0.0, help='每个请求的延迟（秒）')
+    parser.add_argument('--pages', type=int, default=None, help='评论总页数，默认以录制数据为准')
+    parser.add_argument('--page-size', type=int, default=20, help='生成页的评论条数')
+    parser.add_argument('--quiet', action='store_true', help='不输出请求日志')
+    args = parser.parse_args()
+
+    server = make_server(args.port, args.fixtures, args.latency,
+                         args.pages, args.page_size, args.quiet)
+    print(f"桩服务器已启动: http://127.0.0.1:{args.port}/item.htm")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -16,7 +16,67 @@ class ConfigManager:
                 'MAX': 3
             },
             'LOGIN_TIMEOUT': 30,          # 登录等待时间
-            'RETRY_TIMES': 3              # 重试次数
+            'RETRY_TIMES': 3,             # 重试次数
+            'MIN_REQUEST_INTERVAL': 0,    # 单个驱动两次页面请求的最小间隔（秒）
+            'ADAPTIVE_WAIT': {            # 自适应等待：目标元素出现即继续
+                'TIMEOUT': 10,            # 最长等待时间（秒）
+                'POLL_INTERVAL': 0.2      # 轮询间隔（秒）
+            },
+            'SELECTOR_CACHE_FILE': 'selector_cache.json',  # 选择器命中缓存（位于 OUTPUT.BASE_DIR/cache）
+            'POOL': {                     # 浏览器池（多商品并发爬取）
+                'SIZE': 3                 # 驱动数量
+            },
+            'CAPTURE': {                  # 截获页面自己请求的评论接口响应
+                'ENABLED': False,
+                'URL_PATTERNS': [         # 评论接口URL特征
+                    'mtop.taobao.rate.detaillist.get',
+                    'mtop.alibaba.review.list.for.new.pc.detail',
+                    'rate.tmall.com/list_detail_rate.htm',
+                    'rate.taobao.com/feedRateList.htm'
+                ]
+            },
+            'CHECKPOINT': {               # 爬取进度保存（位于 OUTPUT.BASE_DIR/DIR）
+                'ENABLED': True,
+                'DIR': 'crawl_state'
+            },
+            'SESSION': {                  # 登录状态持久化（位于 OUTPUT.BASE_DIR/DIR）
+                'DIR': 'session',
+                'COOKIE_FILE': 'cookies.json',    # 登录成功后保存的Cookie
+                'USER_DATA_DIR': 'chrome_profile',  # 浏览器用户目录，留空则不使用
+                'LOGIN_MARKERS': ['unb'],  # 已登录才有的会话Cookie，需全部存在
+                'CHECK_INTERVAL': 1       # 等待登录时的检查间隔（秒）
+            },
+            'LEAN_PROFILE': {             # 精简浏览器配置（只读取文本，不加载媒体资源）
+                'ENABLED': False,
+                'HEADLESS': True,         # 无头模式（首次登录需要可见窗口）
+                'WINDOW_SIZE': '1280,800',
+                'BLOCK_IMAGES': True,     # 禁止加载图片
+                'BLOCKED_URLS': [         # 通过CDP屏蔽的资源URL
+                    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.svg', '*.ico',
+                    '*.mp4', '*.m3u8', '*.flv', '*.webm',
+                    '*.woff', '*.woff2', '*.ttf', '*.otf'
+                ]
+            },
+            'REPLAY': {                   # 回放模式：访问本地桩服务器（tools/stub_server.py）
+                'ENABLED': False,
+                'BASE_URL': 'http://127.0.0.1:8765'
+            },
+            'DEDUP': {                    # 评论去重
+                'ENABLED': True,
+                'DROP_PLACEHOLDERS': True,    # 丢弃"此用户没有填写评价"等默认评价
+                'NEAR_DUPLICATE': {       # MinHash/LSH 近似去重
+                    'ENABLED': False,
+                    'THRESHOLD': 0.8,     # 估计相似度阈值
+                    'NUM_PERM': 64,       # 签名长度
+                    'BANDS': 16           # LSH 分段数
+                },
+                'CROSS_RUN': {            # 跨运行去重（布隆过滤器，位于 OUTPUT.BASE_DIR/cache）
+                    'ENABLED': False,
+                    'FILE': 'review_bloom.bin',
+                    'CAPACITY': 1000000,  # 预计评论数量
+                    'ERROR_RATE': 0.001   # 误判率
+                }
+            }
         },
         
         # 分析设置
@@ -24,7 +84,48 @@ class ConfigManager:
             'MIN_WORD_LENGTH': 2,         # 最小词长度
             'TOP_WORDS_COUNT': 100,       # 词频统计TOP N
             'TOPIC_COUNT': 3,             # 主题数量
-            'WORDS_PER_TOPIC': 10         # 每个主题的关键词数量
+            'WORDS_PER_TOPIC': 10,        # 每个主题的关键词数量
+            'SEGMENT_WORKERS': 1,         # 并行分词进程数（1表示串行）
+            'SEGMENT_CHUNK_SIZE': 2000,   # 每个分词任务的评论条数
+            'SEGMENT_CACHE': {            # 分词缓存（位于 OUTPUT.BASE_DIR/cache）
+                'ENABLED': True,
+                'FILE': 'segment_cache.sqlite',
+                'MAX_ENTRIES': 1000000    # 最大缓存条数，超出按最近使用淘汰
+            },
+            'PIPELINE': {                 # 流水线模式：边爬取边分词
+                'ENABLED': False,
+                'QUEUE_SIZE': 100,        # 队列最多缓存的页数
+                'BATCH_PAGES': 10         # 每次最多合并分词的页数
+            },
+            'STREAMING': {                # 流式分析（适用于超大评论文件）
+                'ENABLED': False,
+                'CHUNK_SIZE': 5000        # 每次读入的评论条数
+            },
+            'LDA': {                      # LDA训练参数
+                'BACKEND': 'single',      # single: LdaModel, multicore: LdaMulticore
+                'WORKERS': None,          # multicore 工作进程数，None 表示 CPU核数-1
+                'PASSES': 10,             # 语料遍历次数
+                'CHUNKSIZE': 2000,        # 每批文档数
+                'ITERATIONS': 50          # 每篇文档的推断迭代次数
+            },
+            'MODEL': {                    # 模型持久化（保存在运行目录的 models 下）
+                'SAVE': True,             # 保存模型和词典
+                'INCREMENTAL': False,     # 基于最近一次保存的模型增量训练
+                'MAX_DELTA_RATIO': 0.5    # 新文档占比超过该值时改为全量训练
+            },
+            'PRUNING': {                  # 训练前词表裁剪（同时使用 MIN_WORD_LENGTH）
+                'ENABLED': True,
+                'NO_BELOW': 2,            # 最少出现的文档数
+                'NO_ABOVE': 0.5,          # 最多出现的文档比例
+                'KEEP_N': None            # 保留词数，None 表示使用 TOP_WORDS_COUNT
+            },
+            'TOPIC_SWEEP': {              # 主题数扫描（并行训练多个主题数并按一致性择优）
+                'ENABLED': False,
+                'MIN': 3,
+                'MAX': 10,
+                'STEP': 1,
+                'WORKERS': None           # 并行进程数，None 表示 CPU核数
+            }
         },
         
         # 可视化设置
@@ -33,12 +134,33 @@ class ConfigManager:
                 'WIDTH': 800,
                 'HEIGHT': 400,
                 'MAX_WORDS': 100,
-                'MAX_FONT_SIZE': 100
+                'MAX_FONT_SIZE': 100,
+                'FAST_RENDER': True,      # 直接保存词云位图，不经过 matplotlib
+                'FORMAT': 'png',          # 快速输出格式：png 或 webp
+                'LAYOUT_CACHE': {         # 布局缓存（位于 OUTPUT.BASE_DIR/cache/DIR）
+                    'ENABLED': True,
+                    'DIR': 'wordcloud_layouts',
+                    'MAX_ENTRIES': 64     # 内存中最多保留的布局数
+                }
+            },
+            'LDA_VIS': {                  # pyLDAvis 交互式可视化的计算预算
+                'SAMPLE_DOCS': 10000,     # 抽样文档数上限，0 表示全部
+                'MAX_TERMS': 3000,        # 保留的词数上限，0 表示全部
+                'MDS': 'pcoa',            # 降维方法：pcoa（最快）、mmds、tsne
+                'N_JOBS': 1,              # 并行进程数，-1 表示全部CPU
+                'R': 30,                  # 每个主题显示的词数
+                'JSON_ONLY': False,       # 只保存可视化JSON，不生成HTML
+                'CACHE': True             # 按模型缓存可视化JSON（位于 OUTPUT.BASE_DIR/cache/ldavis）
             },
             'TOPIC_PLOT': {
                 'FIGURE_WIDTH': 10,
                 'FIGURE_HEIGHT': 6,
                 'DPI': 300
+            },
+            'RENDER': {                   # 图表渲染进程池
+                'ENABLED': True,          # 在后台进程中渲染图表，为False时同步渲染
+                'WORKERS': 1,             # 渲染进程数
+                'START_METHOD': 'spawn'   # 进程启动方式：spawn、forkserver 或 fork
             }
         },
         
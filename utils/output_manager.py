@@ -1,20 +1,33 @@
 from pathlib import Path
 from datetime import datetime
+from typing import List
+import re
 import shutil
 from utils import config
 
 class OutputManager:
     """输出文件管理器"""
     
-    def __init__(self, base_dir: str = 'output'):
+    # 运行目录名格式：YYYYmmdd_HHMMSS
+    RUN_DIR_PATTERN = re.compile(r'^\d{8}_\d{6}$')
+    # 批量分析目录名格式：YYYYmmdd_HHMMSS_batch，其下每个商品一个运行目录
+    BATCH_DIR_PATTERN = re.compile(r'^\d{8}_\d{6}_batch$')
+    
+    def __init__(self, base_dir: str = 'output', run_name: str = None):
+        """
+        Args:
+            base_dir: 输出基础目录
+            run_name: 运行目录名（可包含子路径，如批量分析时的 批次目录/商品名），
+                      默认使用当前时间戳
+        """
         # 创建基础输出目录
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(exist_ok=True)
         
-        # 创建带时间戳的运行目录
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        self.run_dir = self.base_dir / timestamp
-        self.run_dir.mkdir(exist_ok=True)
+        # 创建运行目录，默认以时间戳命名
+        run_name = run_name or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.run_dir = self.base_dir / run_name
+        self.run_dir.mkdir(parents=True, exist_ok=True)
         
         # 创建子目录
         self.visualization_dir = self.run_dir / 'visualization'
@@ -29,14 +42,25 @@ class OutputManager:
             return self.run_dir / subdir / filename
         return self.run_dir / filename
     
-    def clean_old_runs(self):
-        """清理旧的运行目录，保留最近的几个"""
-        keep_runs = config.get('OUTPUT.KEEP_RUNS', 5)
-        all_runs = sorted(
-            [d for d in self.base_dir.iterdir() if d.is_dir()],
+    @classmethod
+    def list_runs(cls, base_dir: Path) -> List[Path]:
+        """
+        列出基础目录下的运行目录和批量分析目录，按时间从新到旧排列
+        
+        cache 等共享目录和名称不符合格式的目录不包括在内。
+        """
+        return sorted(
+            [d for d in Path(base_dir).iterdir()
+             if d.is_dir() and (cls.RUN_DIR_PATTERN.match(d.name)
+                                or cls.BATCH_DIR_PATTERN.match(d.name))],
             key=lambda x: x.name,
             reverse=True
         )
+    
+    def clean_old_runs(self):
+        """清理旧的运行目录，保留最近的几个（一个批量分析目录算作一次运行）"""
+        keep_runs = config.get('OUTPUT.KEEP_RUNS', 5)
+        all_runs = self.list_runs(self.base_dir)
         
         for old_run in all_runs[keep_runs:]:
             try:
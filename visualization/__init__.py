@@ -1,7 +1,28 @@
-from .word_cloud import WordCloudGenerator
+import importlib
+
+# 导出名称 -> 所在子模块；首次访问时才导入（PEP 562），
+# 导入 visualization 包不会加载 wordcloud、matplotlib 和 pyLDAvis
+_LAZY_EXPORTS = {
+    'WordCloudGenerator': '.word_cloud',
+    'RenderPool': '.render_pool',
+}
 
 __version__ = '1.0.0'
 __author__ = 'Your Name'
 __description__ = 'Visualization module for generating word clouds'
 
-__all__ = ['WordCloudGenerator'] 
\ No newline at end of file
+__all__ = ['WordCloudGenerator', 'RenderPool']
+
+
+def __getattr__(name):
+    """首次访问导出名称时导入所在子模块"""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
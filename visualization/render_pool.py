@@ -0,0 +1,154 @@
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from utils import config
+
+# 工作进程内复用的词云生成器（WordCloud 对象、字体和布局缓存只加载一次）
+_wordcloud_generator = None
+
+
+def _init_worker():
+    """工作进程初始化：使用非交互的 Agg 后端"""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+
+def render_topic_distribution(output_path: Path,
+                              topic_names: Sequence[str],
+                              proportions: np.ndarray,
+                              title: str,
+                              plot_config: Dict) -> Path:
+    """
+    绘制主题分布柱状图（渲染任务，可在工作进程中执行）
+
+    使用独立的 Figure 对象而不是 pyplot 全局状态：图形不会登记到 pyplot，
+    保存后立即清空，长时间运行的进程中不会累积。
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    import seaborn as sns
+
+    fig = Figure(figsize=(plot_config.get('FIGURE_WIDTH', 10),
+                          plot_config.get('FIGURE_HEIGHT', 6)))
+    FigureCanvasAgg(fig)
+    try:
+        ax = fig.add_subplot(1, 1, 1)
+
+        # 设置颜色主题
+        colors = sns.color_palette("husl", len(topic_names))
+
+        # 绘制柱状图
+        bars = ax.bar(topic_names, proportions, color=colors)
+
+        # 添加数值标签
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height,
+                    f'{height:.1%}',
+                    ha='center', va='bottom')
+
+        # 设置图表样式
+        ax.set_title(title, fontsize=14, pad=20)
+        ax.set_xlabel("主题", fontsize=12)
+        ax.set_ylabel("占比", fontsize=12)
+        ax.tick_params(axis='x', labelrotation=45)
+        ax.grid(True, alpha=0.3)
+
+        # 调整布局并保存
+        fig.tight_layout()
+        fig.savefig(output_path, dpi=plot_config.get('DPI', 300), bbox_inches='tight')
+    finally:
+        fig.clear()
+    print(f"主题分布图已保存到: {output_path}")
+    return Path(output_path)
+
+
+def render_wordcloud(word_freq, output_path: Path) -> Optional[Path]:
+    """生成词云图（渲染任务，在工作进程中执行）"""
+    global _wordcloud_generator
+    if _wordcloud_generator is None:
+        from .word_cloud import WordCloudGenerator
+        # 输出路径由主进程确定，工作进程不需要输出管理器
+        _wordcloud_generator = WordCloudGenerator(None)
+    return _wordcloud_generator.generate(word_freq, output_path)
+
+
+class RenderPool:
+    """
+    图表渲染进程池
+
+    把图表渲染任务（主题分布图、词云等）提交到使用 Agg 后端的后台进程，
+    立即返回 Future，分析流程不必等待 matplotlib 绘图和图片写入。
+    进程池在第一次提交任务时创建；未启用时任务在当前进程中同步执行，
+    同样返回（已完成的）Future。
+    """
+
+    def __init__(self):
+        render_config = config.get('VISUALIZATION.RENDER', {})
+        self.enabled = render_config.get('ENABLED', True)   # 为False时同步渲染
+        self.workers = max(1, render_config.get('WORKERS', 1))
+        self.start_method = render_config.get('START_METHOD', 'spawn')
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: List[Tuple[str, Future]] = []
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """创建（首次调用时）并复用进程池"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker
+            )
+        return self._executor
+
+    def submit(self, func: Callable, *args: Any) -> Future:
+        """
+        提交渲染任务
+
+        Args:
+            func: 渲染函数，使用进程池时必须是模块级函数（可被 pickle）
+            *args: 渲染函数的参数
+
+        Returns:
+            任务的 Future，result() 为渲染函数的返回值
+        """
+        if self.enabled:
+            try:
+                future = self._get_executor().submit(func, *args)
+            except Exception as e:
+                print(f"渲染进程池不可用，改为同步渲染: {str(e)}")
+                self.enabled = False
+                return self.submit(func, *args)
+        else:
+            future = Future()
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+        self._jobs.append((func.__name__, future))
+        return future
+
+    def wait(self) -> List[Any]:
+        """
+        等待已提交的任务全部完成
+
+        Returns:
+            成功任务的返回值列表，出错的任务只打印错误
+        """
+        results = []
+        jobs, self._jobs = self._jobs, []
+        for name, future in jobs:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"渲染任务 {name} 出错: {str(e)}")
+        return results
+
+    def close(self):
+        """等待剩余任务完成并关闭进程池"""
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
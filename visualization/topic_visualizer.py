@@ -1,97 +1,281 @@
-import pyLDAvis
-import pyLDAvis.gensim_models
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import List, Optional
-from gensim import corpora, models
+from array import array
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple, Union
+import hashlib
 import numpy as np
 from pathlib import Path
+from utils import config
+from .render_pool import RenderPool, render_topic_distribution
+
+if TYPE_CHECKING:
+    # pyLDAvis、gensim 和 scipy 在用到时才导入，只由JSON生成HTML时不需要加载
+    from gensim import corpora, models
+    from scipy import sparse
+
+
+class _CachedPreparedData:
+    """已生成的 pyLDAvis JSON，save_html 只需要它的 to_json"""
+    
+    def __init__(self, vis_json: str):
+        self.vis_json = vis_json
+        
+    def to_json(self) -> str:
+        return self.vis_json
+
 
 class TopicVisualizer:
     """LDA主题模型可视化器"""
     
-    def __init__(self, output_manager):
+    def __init__(self, output_manager, render_pool: Optional[RenderPool] = None):
         self.output_manager = output_manager
+        self.render_pool = render_pool
+        self.plot_config = config.get('VISUALIZATION.TOPIC_PLOT', {})
+        
+        # pyLDAvis 计算预算：文档抽样、词数上限、降维方法和并行进程数
+        vis_config = config.get('VISUALIZATION.LDA_VIS', {})
+        self.sample_docs = vis_config.get('SAMPLE_DOCS', 10000)
+        self.max_terms = vis_config.get('MAX_TERMS', 3000)
+        self.mds = vis_config.get('MDS', 'pcoa')
+        self.n_jobs = vis_config.get('N_JOBS', 1)
+        self.relevant_terms = vis_config.get('R', 30)
+        self.json_only = vis_config.get('JSON_ONLY', False)
+        self.cache_enabled = vis_config.get('CACHE', True)
+        self.cache_dir = Path(config.get('OUTPUT.BASE_DIR', 'output')) / 'cache' / 'ldavis'
         
     def visualize_lda(self, 
-                     texts: List[List[str]], 
-                     lda_model: models.LdaModel, 
-                     dictionary: corpora.Dictionary) -> None:
+                     corpus: Iterable[List[Tuple[int, int]]], 
+                     lda_model: 'models.LdaModel', 
+                     dictionary: 'corpora.Dictionary',
+                     doc_topics: Optional[np.ndarray] = None) -> None:
         """
         生成交互式LDA可视化
         
+        可视化数据（JSON）按模型、词典、语料和预算参数缓存，输入相同时
+        直接用缓存的JSON生成HTML，跳过降维计算。
+        
         Args:
-            texts: 分词后的文本列表
+            corpus: 训练所用的词袋语料（SparseCorpus、列表或流式语料）
             lda_model: 训练好的LDA模型
             dictionary: 词典对象
+            doc_topics: 已推断的文档-主题分布（行与语料文档对应），为None时对抽样文档推断
         """
         try:
-            # 准备数据
-            corpus = [dictionary.doc2bow(text) for text in texts]
+            term_freqs, term_doc, doc_index = self._sample_term_doc(corpus, dictionary)
+            if doc_topics is not None and doc_index is not None:
+                doc_topics = doc_topics[doc_index]
+            cache_key = self._cache_key(lda_model, dictionary, term_freqs, term_doc)
             
-            # 生成pyLDAvis可视化
-            vis_data = pyLDAvis.gensim_models.prepare(
-                lda_model, corpus, dictionary, 
-                mds='mmds',  # 使用多维尺度缩放
-                sort_topics=False
-            )
+            vis_json = self._load_cached_json(cache_key)
+            if vis_json is None:
+                vis_json = self._prepare(term_freqs, term_doc, lda_model, 
+                                         dictionary, doc_topics).to_json()
+                self._save_cached_json(cache_key, vis_json)
+            else:
+                print("LDA可视化数据命中缓存，跳过降维计算")
             
             # 使用输出管理器获取保存路径
+            json_path = self.output_manager.get_path(
+                'lda_visualization.json',
+                subdir='visualization'
+            )
+            json_path.write_text(vis_json, encoding='utf-8')
+            if self.json_only:
+                print(f"\nLDA可视化数据已保存到: {json_path}")
+                return
+            
             html_path = self.output_manager.get_path(
-                'lda_visualization.html',
+                config.get('OUTPUT.FILE_NAMES.LDA_VIS', 'lda_visualization.html'),
                 subdir='visualization'
             )
-            pyLDAvis.save_html(vis_data, str(html_path))
+            self.render_html(vis_json, html_path)
             print(f"\nLDA交互式可视化已保存到: {html_path}")
             
         except Exception as e:
             print(f"生成LDA可视化时出错: {str(e)}")
     
+    @staticmethod
+    def render_html(vis_json: Union[str, Path], html_path: Path) -> Path:
+        """
+        由 pyLDAvis JSON 生成HTML，不重新计算
+        
+        Args:
+            vis_json: JSON字符串，或 visualize_lda 保存的 lda_visualization.json 路径
+            html_path: HTML输出路径
+        """
+        import pyLDAvis
+        
+        if isinstance(vis_json, Path) or not vis_json.lstrip().startswith('{'):
+            vis_json = Path(vis_json).read_text(encoding='utf-8')
+        with open(html_path, 'w', encoding='utf-8') as f:
+            pyLDAvis.save_html(_CachedPreparedData(vis_json), f)
+        return Path(html_path)
+    
+    def _sample_term_doc(self, 
+                         corpus, 
+                         dictionary: 'corpora.Dictionary'
+                         ) -> Tuple[np.ndarray, 'sparse.csc_matrix', Optional[np.ndarray]]:
+        """
+        全部文档的词频和抽样文档的词-文档矩阵
+        
+        文档数超过 SAMPLE_DOCS 时随机抽样。CSR语料直接按列求和、按列抽取；
+        其他语料（如磁盘上的 MmCorpus）只遍历一遍，累加词频的同时只收集抽中的文档，
+        不把整个语料转换为矩阵。
+        
+        Returns:
+            (词频, 抽样文档的词-文档矩阵CSC, 抽中的文档下标（未抽样时为None）)
+        """
+        from scipy import sparse
+        
+        num_terms, num_docs = len(dictionary), len(corpus)
+        doc_index = None
+        if self.sample_docs and num_docs > self.sample_docs:
+            rng = np.random.RandomState(42)
+            doc_index = np.sort(rng.choice(num_docs, self.sample_docs, replace=False))
+            print(f"LDA可视化抽样 {self.sample_docs}/{num_docs} 篇文档")
+        
+        if hasattr(corpus, 'term_doc_matrix'):
+            term_doc = sparse.csc_matrix(corpus.term_doc_matrix())
+            term_freqs = np.asarray(term_doc.sum(axis=1)).ravel().astype(float)
+            if doc_index is not None:
+                term_doc = term_doc[:, doc_index]
+            return term_freqs, term_doc, doc_index
+        
+        term_freqs = np.zeros(num_terms)
+        selected = np.ones(num_docs, dtype=bool)
+        if doc_index is not None:
+            selected[:] = False
+            selected[doc_index] = True
+        indptr = array('q', [0])
+        indices = array('i')
+        data = array('f')
+        for doc_id, bow in enumerate(corpus):
+            if bow:
+                token_ids, counts = zip(*bow)
+                # 同一文档的词袋中词ID不重复，可以直接按下标累加
+                term_freqs[list(token_ids)] += counts
+            if selected[doc_id]:
+                if bow:
+                    indices.extend(int(token_id) for token_id in token_ids)
+                    data.extend(counts)
+                indptr.append(len(indices))
+        
+        term_doc = sparse.csc_matrix(
+            (np.frombuffer(data, dtype=np.float32),
+             np.frombuffer(indices, dtype=np.int32),
+             np.frombuffer(indptr, dtype=np.int64)),
+            shape=(num_terms, len(indptr) - 1)
+        )
+        return term_freqs, term_doc, doc_index
+    
+    def _cache_key(self, 
+                   lda_model: 'models.LdaModel', 
+                   dictionary: 'corpora.Dictionary',
+                   term_freqs: np.ndarray,
+                   term_doc: 'sparse.csc_matrix') -> str:
+        """缓存键：模型参数、词表、词频、抽样文档内容和预算参数的哈希"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.ascontiguousarray(lda_model.state.get_lambda()).tobytes())
+        digest.update('\n'.join(dictionary[i] for i in range(len(dictionary))).encode('utf-8'))
+        digest.update(np.ascontiguousarray(term_freqs).tobytes())
+        for values in (term_doc.indptr, term_doc.indices, term_doc.data):
+            digest.update(np.ascontiguousarray(values).tobytes())
+        digest.update(repr((self.sample_docs, self.max_terms, self.mds, 
+                            self.relevant_terms)).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _load_cached_json(self, cache_key: str) -> Optional[str]:
+        """读取缓存的可视化JSON，未启用或未命中时返回None"""
+        if not self.cache_enabled:
+            return None
+        path = self.cache_dir / f'{cache_key}.json'
+        if path.exists():
+            return path.read_text(encoding='utf-8')
+        return None
+    
+    def _save_cached_json(self, cache_key: str, vis_json: str):
+        """写入可视化JSON缓存"""
+        if not self.cache_enabled:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            (self.cache_dir / f'{cache_key}.json').write_text(vis_json, encoding='utf-8')
+        except Exception as e:
+            print(f"保存LDA可视化缓存出错: {str(e)}")
+    
+    def _prepare(self,
+                 term_freqs: np.ndarray,
+                 term_doc: 'sparse.csc_matrix',
+                 lda_model: 'models.LdaModel',
+                 dictionary: 'corpora.Dictionary',
+                 doc_topics: Optional[np.ndarray]):
+        """
+        按预算准备 pyLDAvis 数据
+        
+        词频使用全部文档，文档长度和文档-主题分布使用 _sample_term_doc 抽样的文档；
+        只保留词频最高的 MAX_TERMS 个词，主题-词分布按行重新归一化。
+        """
+        import pyLDAvis
+        from gensim import matutils
+        
+        num_terms = term_doc.shape[0]
+        term_freqs = term_freqs.copy()
+        term_freqs[term_freqs == 0] = 0.01
+        doc_lengths = np.asarray(term_doc.sum(axis=0)).ravel()
+        
+        if doc_topics is None:
+            gamma, _ = lda_model.inference(matutils.Sparse2Corpus(term_doc))
+            doc_topics = gamma / gamma.sum(axis=1)[:, None]
+        
+        # 词数上限
+        topic_term = lda_model.state.get_lambda()
+        term_index = np.arange(num_terms)
+        if self.max_terms and num_terms > self.max_terms:
+            term_index = np.sort(np.argsort(-term_freqs, kind='stable')[:self.max_terms])
+            print(f"LDA可视化保留词频最高的 {self.max_terms}/{num_terms} 个词")
+        topic_term = topic_term[:, term_index]
+        topic_term = topic_term / topic_term.sum(axis=1)[:, None]
+        
+        return pyLDAvis.prepare(
+            topic_term_dists=topic_term,
+            doc_topic_dists=doc_topics,
+            doc_lengths=doc_lengths,
+            vocab=[dictionary[i] for i in term_index],
+            term_frequency=term_freqs[term_index],
+            R=self.relevant_terms,
+            mds=self.mds,
+            n_jobs=self.n_jobs,
+            sort_topics=False
+        )
+    
     def plot_topic_distribution(self, 
                               topic_names: List[str], 
                               proportions: np.ndarray,
-                              title: str = "主题分布") -> None:
+                              title: str = "主题分布") -> Optional[Future]:
         """
         绘制主题分布柱状图
         
+        有渲染进程池时提交到后台进程并立即返回，不等待绘图和图片写入。
+        
         Args:
             topic_names: 主题名称列表
             proportions: 主题占比数组
             title: 图表标题
+            
+        Returns:
+            使用渲染进程池时返回任务的Future，否则返回None
         """
         try:
-            plt.figure(figsize=(10, 6))
-            
-            # 设置颜色主题
-            colors = sns.color_palette("husl", len(topic_names))
-            
-            # 绘制柱状图
-            bars = plt.bar(topic_names, proportions, color=colors)
-            
-            # 添加数值标签
-            for bar in bars:
-                height = bar.get_height()
-                plt.text(bar.get_x() + bar.get_width()/2., height,
-                        f'{height:.1%}',
-                        ha='center', va='bottom')
-            
-            # 设置图表样式
-            plt.title(title, fontsize=14, pad=20)
-            plt.xlabel("主题", fontsize=12)
-            plt.ylabel("占比", fontsize=12)
-            plt.xticks(rotation=45)
-            plt.grid(True, alpha=0.3)
-            
-            # 调整布局并保存
-            plt.tight_layout()
-            
             # 使用输出管理器获取保存路径
             output_path = self.output_manager.get_path(
                 'topic_distribution.png',
                 subdir='visualization'
             )
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            print(f"主题分布图已保存到: {output_path}")
+            args = (output_path, list(topic_names), np.asarray(proportions), 
+                    title, self.plot_config)
+            if self.render_pool is not None:
+                return self.render_pool.submit(render_topic_distribution, *args)
+            render_topic_distribution(*args)
             
         except Exception as e:
-            print(f"绘制主题分布图时出错: {str(e)}") 
\ No newline at end of file
+            print(f"绘制主题分布图时出错: {str(e)}")
+        return None
@@ -1,13 +1,31 @@
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
+import hashlib
+import io
+import json
 import os
 from pathlib import Path
-from collections import Counter
-from typing import Optional, Union
+from random import Random
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 from utils import config
+from .render_pool import RenderPool, render_wordcloud
+
+if TYPE_CHECKING:
+    # PIL、wordcloud 和 matplotlib 在第一次生成词云时才导入
+    from PIL import Image, ImageFont
+    from wordcloud import WordCloud
+
+# 布局计算方式变化时递增，使旧的布局缓存失效
+LAYOUT_VERSION = 2
 
 class WordCloudGenerator:
-    """词云生成器，用于生成词云图像"""
+    """
+    词云生成器，用于生成词云图像
+    
+    同一个生成器可以连续为多个商品生成词云：WordCloud 对象只创建一次，绘制时
+    各字号的字体对象只加载一次，相同的高频词输入直接复用缓存的布局。
+    计算布局时 wordcloud 仍会按尝试的每个字号从字体文件加载字体。
+    """
     
     def __init__(self, output_manager):
         # 从配置获取词云参数
@@ -21,9 +39,24 @@ class WordCloudGenerator:
         self.prefer_horizontal = wordcloud_config.get('PREFER_HORIZONTAL', 0.9)
         self.margin = wordcloud_config.get('MARGIN', 10)
         
+        # 快速输出：直接把词云位图写入 PNG/WebP，不经过 matplotlib 重新栅格化
+        self.fast_render = wordcloud_config.get('FAST_RENDER', True)
+        self.image_format = wordcloud_config.get('FORMAT', 'png').lower()
+        
+        # 布局缓存：按前 MAX_WORDS 个词的词频向量缓存布局，相同输入跳过布局计算
+        cache_config = wordcloud_config.get('LAYOUT_CACHE', {})
+        self.layout_cache_enabled = cache_config.get('ENABLED', True)
+        self.layout_cache_size = cache_config.get('MAX_ENTRIES', 64)
+        self.layout_cache_dir = (Path(config.get('OUTPUT.BASE_DIR', 'output'))
+                                 / 'cache' / cache_config.get('DIR', 'wordcloud_layouts'))
+        self._layouts: OrderedDict = OrderedDict()
+        
         self.font_path = self._get_font_path()
         self.output_manager = output_manager
-        
+        self._wc: Optional['WordCloud'] = None
+        self._font_data: Optional[bytes] = None
+        self._fonts: Dict[int, 'ImageFont.FreeTypeFont'] = {}
+    
     def _get_font_path(self) -> str:
         """获取字体文件路径"""
         # 可能的字体路径
@@ -48,12 +81,12 @@ class WordCloudGenerator:
         env_font = os.environ.get('WORDCLOUD_FONT_PATH')
         if env_font and Path(env_font).exists():
             return env_font
-            
+        
         # 检查可能的路径
         for path in possible_paths:
             if Path(path).exists():
                 return str(path)
-                
+        
         raise FileNotFoundError(
             "未找到可用的中文字体文件。\n"
             "请尝试以下方法：\n"
@@ -62,14 +95,11 @@ class WordCloudGenerator:
             "3. 将字体文件放在当前目录"
         )
     
-    def generate(self, word_freq: Counter) -> None:
-        """生成词云图"""
-        try:
-            if not word_freq:
-                raise ValueError("词频数据为空")
-                
-            # 创建词云对象
-            wc = WordCloud(
+    def _get_wordcloud(self) -> 'WordCloud':
+        """创建（首次调用时）并复用 WordCloud 对象"""
+        if self._wc is None:
+            from wordcloud import WordCloud
+            self._wc = WordCloud(
                 font_path=self.font_path,
                 width=self.width,
                 height=self.height,
@@ -81,28 +111,194 @@ class WordCloudGenerator:
                 prefer_horizontal=self.prefer_horizontal,
                 margin=self.margin
             )
+        return self._wc
+    
+    def _get_font(self, size: int) -> 'ImageFont.FreeTypeFont':
+        """按字号缓存字体对象，字体文件只读取一次"""
+        font = self._fonts.get(size)
+        if font is None:
+            from PIL import ImageFont
             
-            # 生成词云
-            wc.generate_from_frequencies(word_freq)
+            if self._font_data is None:
+                self._font_data = Path(self.font_path).read_bytes()
+            font = ImageFont.truetype(io.BytesIO(self._font_data), size)
+            self._fonts[size] = font
+        return font
+    
+    def _layout_key(self, word_freq: Counter) -> str:
+        """布局缓存键：前 MAX_WORDS 个词的词频向量和影响布局的参数"""
+        top_words = sorted(word_freq.items(), key=lambda x: (-x[1], x[0]))[:self.max_words]
+        params = [LAYOUT_VERSION, self.width, self.height, self.max_words, self.max_font_size,
+                  self.min_font_size, self.prefer_horizontal, self.margin,
+                  Path(self.font_path).name]
+        payload = json.dumps([params, top_words], ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _encode_layout(layout: List) -> List:
+        """布局转换为可写入JSON的形式"""
+        return [[[word, float(count)], int(font_size), [int(v) for v in position],
+                 None if orientation is None else int(orientation), color]
+                for (word, count), font_size, position, orientation, color in layout]
+    
+    @staticmethod
+    def _decode_layout(data: List) -> List:
+        """从JSON还原布局"""
+        from PIL import Image
+        
+        return [(tuple(word_count), font_size, tuple(position),
+                 None if orientation is None else Image.Transpose(orientation), color)
+                for word_count, font_size, position, orientation, color in data]
+    
+    def _load_layout(self, key: str) -> Optional[List]:
+        """依次从内存和磁盘缓存读取布局"""
+        if key in self._layouts:
+            self._layouts.move_to_end(key)
+            return self._layouts[key]
+        path = self.layout_cache_dir / f'{key}.json'
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    layout = self._decode_layout(json.load(f))
+                self._remember_layout(key, layout)
+                return layout
+            except Exception as e:
+                print(f"读取词云布局缓存出错: {str(e)}")
+        return None
+    
+    def _remember_layout(self, key: str, layout: List):
+        """放入内存缓存，超出容量时淘汰最久未用的布局"""
+        self._layouts[key] = layout
+        self._layouts.move_to_end(key)
+        while len(self._layouts) > self.layout_cache_size:
+            self._layouts.popitem(last=False)
+    
+    def _save_layout(self, key: str, layout: List):
+        """写入内存和磁盘缓存"""
+        self._remember_layout(key, layout)
+        try:
+            self.layout_cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.layout_cache_dir / f'{key}.json'
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._encode_layout(layout), f, ensure_ascii=False)
+            tmp_path.replace(path)
+        except Exception as e:
+            print(f"保存词云布局缓存出错: {str(e)}")
+    
+    def _compute_layout(self, word_freq: Counter) -> List:
+        """计算词云布局，启用缓存时相同输入直接复用"""
+        key = None
+        if self.layout_cache_enabled:
+            key = self._layout_key(word_freq)
+            layout = self._load_layout(key)
+            if layout is not None:
+                print("词云布局命中缓存")
+                return layout
+        
+        wc = self._get_wordcloud()
+        # 复用的 WordCloud 会延续上一次布局的随机状态，每次重置，
+        # 使相同输入的布局与之前处理过多少商品无关，并与缓存的布局一致
+        wc.random_state = Random(42)
+        wc.generate_from_frequencies(word_freq)
+        layout = wc.layout_
+        if key is not None:
+            self._save_layout(key, layout)
+        return layout
+    
+    def _render(self, layout: List) -> 'Image.Image':
+        """按布局绘制词云位图（与 WordCloud.to_image 相同，但复用已加载的字体）"""
+        from PIL import Image, ImageDraw, ImageFont
+        
+        img = Image.new('RGB', (self.width, self.height), self.background_color)
+        draw = ImageDraw.Draw(img)
+        for (word, count), font_size, position, orientation, color in layout:
+            font = ImageFont.TransposedFont(self._get_font(int(font_size)),
+                                            orientation=orientation)
+            draw.text((int(position[1]), int(position[0])), word, fill=color, font=font)
+        return img
+    
+    def _get_output_path(self, output_path: Union[str, Path, None]) -> Path:
+        """默认输出到运行目录的 visualization 子目录，扩展名与输出格式一致"""
+        if output_path is not None:
+            return Path(output_path)
+        filename = config.get('OUTPUT.FILE_NAMES.WORDCLOUD', 'wordcloud.png')
+        if self.fast_render:
+            filename = str(Path(filename).with_suffix(f'.{self.image_format}'))
+        return self.output_manager.get_path(filename, subdir='visualization')
+    
+    def generate(self,
+                 word_freq: Counter,
+                 output_path: Union[str, Path, None] = None) -> Optional[Path]:
+        """
+        生成词云图
+        
+        Args:
+            word_freq: 词频统计
+            output_path: 输出文件路径，默认保存到运行目录的 visualization 子目录
+        
+        Returns:
+            词云图路径，失败时返回None
+        """
+        try:
+            if not word_freq:
+                raise ValueError("词频数据为空")
             
-            # 使用输出管理器获取保存路径
-            output_path = self.output_manager.get_path(
-                'wordcloud.png', 
-                subdir='visualization'
-            )
-            plt.figure(figsize=(10, 5))
-            plt.imshow(wc, interpolation='bilinear')
-            plt.axis('off')
-            plt.savefig(output_path, bbox_inches='tight', pad_inches=0.1, dpi=300)
-            plt.close()
+            output_path = self._get_output_path(output_path)
+            layout = self._compute_layout(word_freq)
             
-            print(f"词云图已保存到: {output_path}")
+            if self.fast_render:
+                # 直接保存词云位图
+                image = self._render(layout)
+                if self.image_format == 'webp':
+                    image.save(output_path, format='WEBP', lossless=True)
+                else:
+                    image.save(output_path, optimize=True)
+            else:
+                import matplotlib.pyplot as plt
+                
+                wc = self._get_wordcloud()
+                wc.layout_ = layout
+                fig = plt.figure(figsize=(10, 5))
+                try:
+                    plt.imshow(wc, interpolation='bilinear')
+                    plt.axis('off')
+                    plt.savefig(output_path, bbox_inches='tight', pad_inches=0.1, dpi=300)
+                finally:
+                    plt.close(fig)
             
+            print(f"词云图已保存到: {output_path}")
+            return output_path
+        
         except Exception as e:
             print(f"生成词云图时出错: {str(e)}")
             # 输出词频统计作为备选
             print("\n词频统计:")
-            for word, freq in sorted(word_freq.items(), 
-                                   key=lambda x: x[1], 
+            for word, freq in sorted(word_freq.items(),
+                                   key=lambda x: x[1],
                                    reverse=True)[:20]:
-                print(f"{word}: {freq}次") 
\ No newline at end of file
+                print(f"{word}: {freq}次")
+            return None
+    
+    def submit(self,
+               render_pool: RenderPool,
+               word_freq: Counter,
+               output_path: Union[str, Path, None] = None) -> Future:
+        """
+        提交到渲染进程池生成词云图，立即返回
+        
+        输出路径在当前进程确定；后台进程使用自己的生成器，布局磁盘缓存共享。
+        渲染进程池未启用时直接用本生成器同步生成。
+        
+        Args:
+            render_pool: 渲染进程池（RenderPool）
+            word_freq: 词频统计
+            output_path: 输出文件路径，默认保存到运行目录的 visualization 子目录
+        
+        Returns:
+            任务的Future，result() 与 generate 的返回值相同
+        """
+        output_path = self._get_output_path(output_path)
+        if render_pool.enabled:
+            return render_pool.submit(render_wordcloud, word_freq, output_path)
+        return render_pool.submit(self.generate, word_freq, output_path)